@@ -4,9 +4,16 @@ __version__ = "0.1.0"
 __author__ = "Zerofuchs Software"
 __license__ = "MIT"
 
+import importlib
+
 # Import key classes for convenience
 from .core import ChatController, ProviderManager
-from .core.providers import LMStudioProvider, ClaudeProvider
+
+def __getattr__(name):
+    # Provider classes are imported on first access (PEP 562)
+    if name in ('LMStudioProvider', 'ClaudeProvider'):
+        return getattr(importlib.import_module('.core.providers', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "core",
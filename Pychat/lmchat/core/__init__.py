@@ -1,4 +1,6 @@
 """Core components"""
+import importlib
+
 from .chat import ChatController
 from .models import Conversation, Message, Config, CommandResult
 from .controllers import (
@@ -7,12 +9,13 @@ from .controllers import (
     SessionController,
     CommandController
 )
-from .providers import (
-    ProviderManager,
-    LLMProvider,
-    LMStudioProvider,
-    ClaudeProvider
-)
+from .providers import ProviderManager, LLMProvider
+
+def __getattr__(name):
+    # Concrete providers resolve lazily through the providers package
+    if name in ('LMStudioProvider', 'ClaudeProvider'):
+        return getattr(importlib.import_module('.providers', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'ChatController',
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Response cache - replays answers to prompts that were already sent
+"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Generator, List, Optional
+
+from .fastjson import dumps
+
+class SemanticCache:
+    """Exact-match cache of completions, keyed on provider, endpoint, model and messages"""
+
+    # Size of the pieces a cached response is replayed in
+    REPLAY_CHUNK = 16
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "prompt_hash TEXT PRIMARY KEY, response TEXT NOT NULL, ts REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key(provider: str, endpoint: str, model: Optional[str], messages: List[Dict]) -> str:
+        """
+        Hash identifying one request
+        provider is the configured provider name, not its type, and endpoint
+        its server URL, so two servers with the same model never share entries
+        """
+        return hashlib.sha256(dumps([provider, endpoint, model, messages])).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for a key, if any"""
+        row = self._db.execute(
+            "SELECT response FROM responses WHERE prompt_hash = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, response: str):
+        """Store a completed response"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (prompt_hash, response, ts) VALUES (?, ?, ?)",
+            (key, response, time.time())
+        )
+        self._db.commit()
+
+    def replay(self, response: str) -> Generator[str, None, None]:
+        """Yield a cached response in pieces, like a live stream"""
+        size = self.REPLAY_CHUNK
+        for i in range(0, len(response), size):
+            yield response[i:i + size]
+
+    def clear(self):
+        """Drop every cached response"""
+        self._db.execute("DELETE FROM responses")
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
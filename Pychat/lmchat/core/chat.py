@@ -3,9 +3,14 @@
 Core ChatController - Orchestrates all components
 """
 
+import atexit
 import sys
+import threading
+import time
+import weakref
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional
 
 from .models import Conversation, Config, CommandResult
 from .controllers import (
@@ -14,15 +19,40 @@ from .controllers import (
     SessionController,
     CommandController
 )
-from .providers import ProviderManager, LMStudioProvider, ClaudeProvider
+from .providers import ProviderManager
+
+# Streamed output is flushed once this many characters are pending or this
+# many seconds have passed since the last flush
+STREAM_FLUSH_BYTES = 64
+STREAM_FLUSH_INTERVAL = 0.03
+
+# Set once stdin/stdout have been switched to UTF-8
+_UTF8_CONFIGURED = False
+
+def _close_at_exit(chat_ref: "weakref.ref"):
+    """atexit hook for controllers that are still alive at shutdown"""
+    chat = chat_ref()
+    if chat is not None:
+        chat.close()
+
+@lru_cache(maxsize=None)
+def _banner(provider_name: str) -> str:
+    """Response prefix shown before streamed output"""
+    return f"\n{provider_name.title()}: "
 
 class ChatController:
     """Main controller that orchestrates all chat functionality"""
     
     def __init__(self, config_path: Optional[Path] = None, verbose: bool = False):
-        # Force UTF-8
-        sys.stdout.reconfigure(encoding='utf-8')
-        sys.stdin.reconfigure(encoding='utf-8')
+        # Force UTF-8 (once per process)
+        global _UTF8_CONFIGURED
+        if not _UTF8_CONFIGURED:
+            try:
+                sys.stdout.reconfigure(encoding='utf-8')
+                sys.stdin.reconfigure(encoding='utf-8')
+            except AttributeError:
+                pass  # Replaced streams (e.g. io.StringIO) have no reconfigure
+            _UTF8_CONFIGURED = True
         
         # Store verbose flag
         self.verbose = verbose
@@ -40,6 +70,14 @@ class ChatController:
             self.config.data = Config.get_default_config()
             self.config.save()
         
+        # System prompt prefix shared by every API request
+        self._refresh_messages_prefix()
+        
+        # Response cache, opened on first use when "response_cache" is enabled
+        self._response_cache = None
+        # Close it at exit; weak so a discarded controller can be collected
+        atexit.register(_close_at_exit, weakref.ref(self))
+        
         # Initialize provider manager
         self.providers = ProviderManager()
         self._setup_providers()
@@ -51,7 +89,9 @@ class ChatController:
         self.commands = CommandController()
         
         # Initialize conversation
-        self.conversation = Conversation()
+        self.conversation = Conversation(
+            max_messages=self.config.get("max_conversation_length", 100)
+        )
         
         # Register built-in commands
         self._register_builtin_commands()
@@ -68,18 +108,19 @@ class ChatController:
             "temperature": self.config.get("temperature", 0.7)
         }
         
-        # Add default provider
-        result = self.providers.add_provider("default", default_provider)
-        if not result.success:
-            print(f"Warning: Could not setup default provider: {result.error}")
-        
-        # Load additional providers from config
+        # Add the default and any configured providers, probing them all
+        # at once; a configured "default" replaces the built-in one
         providers_config = self.config.get("providers", {})
+        results = self.providers.add_providers({"default": default_provider, **providers_config})
+        
+        if "default" not in providers_config and not results["default"].success:
+            print(f"Warning: Could not setup default provider: {results['default'].error}")
+        
         loaded_providers = []
         failed_providers = []
         
-        for name, pconfig in providers_config.items():
-            result = self.providers.add_provider(name, pconfig)
+        for name in providers_config:
+            result = results[name]
             if result.success:
                 loaded_providers.append(name)
             else:
@@ -147,6 +188,13 @@ class ChatController:
             "Show or set configuration"
         )
         
+        # Send a message around the response cache
+        self.commands.register_command(
+            "nocache",
+            self._handle_nocache_command,
+            "Send a message without using the response cache"
+        )
+        
         # Exit commands
         self.commands.register_command(
             "exit",
@@ -179,7 +227,7 @@ class ChatController:
     
     def _handle_model_command(self, args: str):
         """Handle model command"""
-        provider = self.providers.get_current()
+        provider = self.providers.current
         if not provider:
             print("No provider configured")
             return
@@ -207,20 +255,20 @@ class ChatController:
         else:
             # Parse key=value
             if '=' in args:
-                key, value = args.split('=', 1)
+                key, _, value = args.partition('=')
                 key = key.strip()
                 value = value.strip()
                 
                 # Try to parse value as appropriate type
                 try:
-                    if value.lower() in ('true', 'false'):
-                        value = value.lower() == 'true'
-                    elif value.isdigit():
-                        value = int(value)
-                    elif '.' in value and value.replace('.', '').isdigit():
+                    value = int(value)
+                except ValueError:
+                    try:
                         value = float(value)
-                except:
-                    pass
+                    except ValueError:
+                        lowered = value.lower()
+                        if lowered in ('true', 'false'):
+                            value = lowered == 'true'
                 
                 # Handle nested keys (e.g., providers.claude.api_key)
                 if '.' in key:
@@ -231,14 +279,54 @@ class ChatController:
                             current[k] = {}
                         current = current[k]
                     current[keys[-1]] = value
+                    self.config.mark_dirty()
                 else:
                     self.config.set(key, value)
+                    if key == "max_conversation_length" and isinstance(value, int):
+                        self.conversation.set_max_messages(value)
+                    elif key == "system_prompt":
+                        self._refresh_messages_prefix()
                 
-                self.config.save()
                 print(f"Set {key} = {value}")
             else:
                 print("Usage: /config key=value")
     
+    def _handle_nocache_command(self, args: str):
+        """Handle nocache command"""
+        if not args:
+            print("Usage: /nocache <message>")
+            return
+        self.send_message(args, use_cache=False)
+    
+    def _get_response_cache(self):
+        """Response cache if enabled in config, opened on first use"""
+        if not self.config.get("response_cache", False):
+            return None
+        if self._response_cache is None:
+            from .cache import SemanticCache
+            self._response_cache = SemanticCache(self.app_dir / "response_cache.db")
+        return self._response_cache
+    
+    def _response_cache_key(self, cache, provider, messages: List[dict]) -> str:
+        """Cache key for a request to the current provider"""
+        endpoint = getattr(provider, "base_url", None) or getattr(provider, "api_url", "")
+        return cache.key(self.providers.current_provider, endpoint,
+                         provider.config.get("model"), messages)
+    
+    def close(self):
+        """Close the response cache, if it was opened"""
+        cache, self._response_cache = self._response_cache, None
+        if cache is not None:
+            cache.close()
+    
+    def _refresh_messages_prefix(self):
+        """Rebuild the system prompt messages sent ahead of the conversation"""
+        system_prompt = self.config.get("system_prompt")
+        self._system_prompt = system_prompt or None
+        self._messages_prefix = (
+            [{"role": "system", "content": system_prompt}] if system_prompt else []
+        )
+    
     def _clear_conversation(self):
         """Clear conversation history"""
         self.conversation.clear()
@@ -246,12 +334,12 @@ class ChatController:
     
     def test_connection(self) -> bool:
         """Test current provider connection"""
-        provider = self.providers.get_current()
+        provider = self.providers.current
         return provider.test_connection() if provider else False
     
-    def send_message(self, message: str) -> bool:
+    def send_message(self, message: str, use_cache: bool = True) -> bool:
         """Send a message and handle the response"""
-        provider = self.providers.get_current()
+        provider = self.providers.current
         if not provider:
             print("No LLM provider configured")
             return False
@@ -259,43 +347,69 @@ class ChatController:
         # Add user message
         self.conversation.add_message("user", message)
         
-        # Build messages for API
-        messages = []
+        return self._stream_response(provider, self.conversation.get_messages_for_api(), use_cache)
+    
+    def send_messages(self, prompts: List[str], max_concurrency: int = 4,
+                      on_prompt: Optional[Callable[[str], None]] = None) -> bool:
+        """Send independent prompts concurrently, printing the answers in order"""
+        provider = self.providers.current
+        if not provider:
+            print("No LLM provider configured")
+            return False
         
-        # Add system prompt if configured
-        system_prompt = self.config.get("system_prompt")
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+        # Every prompt sees the conversation as it stood before the batch
+        history = self._messages_prefix + self.conversation.get_messages_for_api()
+        requests = [history + [{"role": "user", "content": prompt}] for prompt in prompts]
         
-        # Add conversation messages
-        messages.extend(self.conversation.get_messages_for_api(
-            max_messages=self.config.get("max_conversation_length", 100)
-        ))
+        # Answer what the response cache can, and only request the rest
+        cache = self._get_response_cache()
+        if cache is not None:
+            keys = [self._response_cache_key(cache, provider, messages) for messages in requests]
+            responses = [cache.get(key) for key in keys]
+        else:
+            responses = [None] * len(requests)
+        missing = [i for i, response in enumerate(responses) if response is None]
+        
+        if missing:
+            import asyncio
+            fetched = asyncio.run(self._collect_all(
+                provider, [requests[i] for i in missing], max_concurrency))
+            for i, response in zip(missing, fetched):
+                responses[i] = response
+                if cache is not None and response and not isinstance(response, Exception):
+                    cache.put(keys[i], response)
+        
+        ok = True
+        for prompt, response in zip(prompts, responses):
+            if on_prompt:
+                on_prompt(prompt)
+            self.conversation.add_message("user", prompt)
+            sys.stdout.write(_banner(provider.name))
+            if isinstance(response, Exception):
+                print(f"\nError: {response}")
+                ok = False
+                continue
+            print(response)
+            if response:
+                self.conversation.add_message("assistant", response)
+        sys.stdout.flush()
+        return ok
+    
+    @staticmethod
+    async def _collect_all(provider, requests: List[List[dict]], limit: int) -> list:
+        """Stream every request to completion, at most limit at a time"""
+        import asyncio
+        semaphore = asyncio.Semaphore(limit)
         
-        # Stream response
-        print(f"\n{provider.name.title()}: ", end="", flush=True)
-        assistant_response = ""
+        async def collect(messages):
+            async with semaphore:
+                return "".join([chunk async for chunk in provider.astream_completion(messages)])
         
-        try:
-            for chunk in provider.stream_completion(messages):
-                print(chunk, end="", flush=True)
-                assistant_response += chunk
-            
-            print()  # New line
-            
-            # Add assistant response to conversation
-            if assistant_response:
-                self.conversation.add_message("assistant", assistant_response)
-            
-            return True
-            
-        except Exception as e:
-            print(f"\nError: {e}")
-            return False
+        return await asyncio.gather(*(collect(m) for m in requests), return_exceptions=True)
     
     def send_image(self, text: str, image_data: str, image_format: str) -> bool:
         """Send a message with an image to the vision model"""
-        provider = self.providers.get_current()
+        provider = self.providers.current
         if not provider:
             print("No LLM provider configured")
             return False
@@ -314,7 +428,7 @@ class ChatController:
             {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/{image_format};base64,{image_data}"
+                    "url": "".join(("data:image/", image_format, ";base64,", image_data))
                 }
             }
         ]
@@ -322,33 +436,73 @@ class ChatController:
         # Add user message with image
         self.conversation.add_message("user", message_content)
         
-        # Build messages for API
-        messages = []
-        
-        # Add system prompt if configured
-        system_prompt = self.config.get("system_prompt")
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        
-        # Add conversation messages
-        messages.extend(self.conversation.get_messages_for_api(
-            max_messages=self.config.get("max_conversation_length", 100)
-        ))
-        
-        # Stream response
-        print(f"\n{provider.name.title()}: ", end="", flush=True)
-        assistant_response = ""
+        return self._stream_response(provider, self.conversation.get_messages_for_api())
+    
+    def _stream_response(self, provider, history: List[dict], use_cache: bool = True) -> bool:
+        """Stream a completion for the conversation to stdout and record it"""
+        parts = []
+        cache = self._get_response_cache() if use_cache else None
+        cache_key = None
+        
+        # Flush by size/time bucket rather than per token to cut write syscalls
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        write(_banner(provider.name))
+        flush()
+        pending = 0
+        last_flush = time.monotonic()
+        # Flushes a partial batch if the next chunk is slow to arrive
+        idle_flush = None
         
         try:
-            for chunk in provider.stream_completion(messages):
-                print(chunk, end="", flush=True)
-                assistant_response += chunk
+            stream = None
+            if cache is not None:
+                messages = self._messages_prefix + history
+                cache_key = self._response_cache_key(cache, provider, messages)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    # Replay the stored answer and skip the request entirely
+                    stream = cache.replay(cached)
+                    cache_key = None
+            if stream is None:
+                # Providers that take the system prompt separately skip the
+                # prefix copy and their own scan for system messages
+                stream_split = getattr(provider, "stream_completion_split", None)
+                if stream_split is not None:
+                    stream = stream_split(self._system_prompt, history)
+                else:
+                    stream = provider.stream_completion(self._messages_prefix + history)
+            
+            try:
+                for chunk in stream:
+                    parts.append(chunk)
+                    write(chunk)
+                    pending += len(chunk)
+                    now = time.monotonic()
+                    if pending >= STREAM_FLUSH_BYTES or now - last_flush > STREAM_FLUSH_INTERVAL:
+                        flush()
+                        pending = 0
+                        last_flush = now
+                        if idle_flush is not None:
+                            idle_flush.cancel()
+                            idle_flush = None
+                    elif idle_flush is None or idle_flush.finished.is_set():
+                        idle_flush = threading.Timer(STREAM_FLUSH_INTERVAL, flush)
+                        idle_flush.daemon = True
+                        idle_flush.start()
+            finally:
+                if idle_flush is not None:
+                    idle_flush.cancel()
+                flush()
             
             print()  # New line
+            assistant_response = "".join(parts)
             
             # Add assistant response to conversation
             if assistant_response:
                 self.conversation.add_message("assistant", assistant_response)
+                if cache_key is not None:
+                    cache.put(cache_key, assistant_response)
             
             return True
             
@@ -358,23 +512,24 @@ class ChatController:
     
     def process_input(self, user_input: str) -> bool:
         """Process user input and return True if should continue"""
-        if not user_input.strip():
+        if not user_input or user_input.isspace():
             return True
         
         # Note: Exit commands are handled as slash commands below
         
+        # Check for slash commands - plain prompts skip the command machinery
+        if user_input[0] == '/':
+            command, args = self.commands.parse_input(user_input)
+            if command:
+                if not self.commands.execute_command(command, args):
+                    print(f"Unknown command: /{command} (use /help)")
+                return True
+        
         # Check for built-in text commands
-        if user_input.lower() == 'clear':
+        elif len(user_input) == 5 and user_input.lower() == 'clear':
             self._clear_conversation()
             return True
         
-        # Check for slash commands
-        command, args = self.commands.parse_input(user_input)
-        if command:
-            if not self.commands.execute_command(command, args):
-                print(f"Unknown command: /{command} (use /help)")
-            return True
-        
         # Regular message
         self.send_message(user_input)
         return True
@@ -387,7 +542,7 @@ class ChatController:
     def run(self):
         """Main interaction loop - can be overridden by view"""
         print("Pyttai - AI Shell")
-        provider = self.providers.get_current()
+        provider = self.providers.current
         if provider:
             print(f"Provider: {provider.name}")
         print("Type /help for commands, 'exit' to quit\n")
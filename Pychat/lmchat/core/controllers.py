@@ -3,32 +3,75 @@
 Business logic controllers for different operations
 """
 
-import json
-import sys
+import io
+import os
+import stat
 import base64
-from typing import Optional, Callable, Generator, Dict, List
+from functools import lru_cache
+from typing import Optional, Callable, Generator, Dict, List, Tuple
 from pathlib import Path
 
-import httpx
-
 from .models import CommandResult, OutputFormat
 
-# Optional clipboard support
-try:
-    import pyperclip
-    HAS_CLIPBOARD = True
-except ImportError:
-    HAS_CLIPBOARD = False
+# Optional clipboard/image support - imported on first use so text-only
+# sessions never pay for loading pyperclip or Pillow
+_UNAVAILABLE = object()
+_pyperclip = None
+_PIL = None
+
+def _get_pyperclip():
+    """Return the pyperclip module, or None if it isn't installed"""
+    global _pyperclip
+    if _pyperclip is None:
+        try:
+            import pyperclip
+            _pyperclip = pyperclip
+        except ImportError:
+            _pyperclip = _UNAVAILABLE
+    return None if _pyperclip is _UNAVAILABLE else _pyperclip
+
+def _get_pil():
+    """Return (ImageGrab, Image) from Pillow, or None if it isn't installed"""
+    global _PIL
+    if _PIL is None:
+        try:
+            from PIL import ImageGrab, Image
+            _PIL = (ImageGrab, Image)
+        except ImportError:
+            _PIL = _UNAVAILABLE
+    return None if _PIL is _UNAVAILABLE else _PIL
+
+# Image read size for streaming base64 encoding (multiple of 3 bytes)
+_B64_READ_CHUNK = 57 * 1024
 
-# Optional image clipboard support
-try:
-    from PIL import ImageGrab, Image
-    import io
-    HAS_IMAGE_CLIPBOARD = True
-except ImportError:
-    HAS_IMAGE_CLIPBOARD = False
+# Prebuilt results for fixed error cases - shared instances, treat as read-only
+_ERR_EMPTY_TEXT = CommandResult.error(
+    "No text provided for TTS generation",
+    code="EMPTY_TEXT",
+    suggestion="Provide some text to convert to speech"
+)
+_ERR_NO_CLIPBOARD = CommandResult.error(
+    "Clipboard functionality not available",
+    code="NO_CLIPBOARD",
+    suggestion="Install pyperclip: pip install pyperclip"
+)
+_ERR_EMPTY_CLIPBOARD = CommandResult.error(
+    "Clipboard is empty",
+    code="EMPTY_CLIPBOARD",
+    suggestion="Copy some text to clipboard first"
+)
+_ERR_NO_IMAGE_CLIPBOARD = CommandResult.error(
+    "Image clipboard functionality not available",
+    code="NO_IMAGE_CLIPBOARD",
+    suggestion="Install Pillow: pip install Pillow"
+)
+_ERR_NO_IMAGE = CommandResult.error(
+    "No image in clipboard",
+    code="NO_IMAGE",
+    suggestion="Copy an image to clipboard first"
+)
 
-# APIController has been replaced by the provider system in providers.py
+# APIController has been replaced by the provider system in providers/
 
 class AudioController:
     """Handles TTS generation and playback"""
@@ -36,11 +79,7 @@ class AudioController:
     def generate_tts(text: str, provider: str = "default") -> CommandResult:
         """Generate TTS audio from text"""
         if not text.strip():
-            return CommandResult.error(
-                "No text provided for TTS generation",
-                code="EMPTY_TEXT",
-                suggestion="Provide some text to convert to speech"
-            )
+            return _ERR_EMPTY_TEXT
         try:
            print("Placeholder")
            return CommandResult.success_text("Audio generated successfully")
@@ -55,23 +94,16 @@ class ClipboardController:
     """Handles clipboard operations"""
     @staticmethod
     def get_clipboard() -> CommandResult:
-        if not HAS_CLIPBOARD:
-            return CommandResult.error(
-                "Clipboard functionality not available",
-                code="NO_CLIPBOARD",
-                suggestion="Install pyperclip: pip install pyperclip"
-            )
+        pyperclip = _get_pyperclip()
+        if pyperclip is None:
+            return _ERR_NO_CLIPBOARD
         
         try:
             content = pyperclip.paste()
             if content:
                 return CommandResult.success_text(content)
             else:
-                return CommandResult.error(
-                    "Clipboard is empty",
-                    code="EMPTY_CLIPBOARD",
-                    suggestion="Copy some text to clipboard first"
-                )
+                return _ERR_EMPTY_CLIPBOARD
         except Exception as e:
             return CommandResult.error(
                 f"Failed to access clipboard: {str(e)}",
@@ -79,26 +111,35 @@ class ClipboardController:
                 suggestion="Check clipboard permissions and try again"
             )
     
+    @staticmethod
+    def get_clipboard_fast() -> Tuple[bool, Optional[str], Optional[str]]:
+        """get_clipboard as (success, content, error), for callers that unwrap it at once"""
+        pyperclip = _get_pyperclip()
+        if pyperclip is None:
+            return False, None, _ERR_NO_CLIPBOARD.error
+        
+        try:
+            content = pyperclip.paste()
+        except Exception as e:
+            return False, None, f"Failed to access clipboard: {str(e)}"
+        if content:
+            return True, content, None
+        return False, None, _ERR_EMPTY_CLIPBOARD.error
+    
     @staticmethod
     def get_image() -> CommandResult:
         """Get image from clipboard"""
-        if not HAS_IMAGE_CLIPBOARD:
-            return CommandResult.error(
-                "Image clipboard functionality not available",
-                code="NO_IMAGE_CLIPBOARD",
-                suggestion="Install Pillow: pip install Pillow"
-            )
-        
+        pil = _get_pil()
+        if pil is None:
+            return _ERR_NO_IMAGE_CLIPBOARD
+        ImageGrab, _ = pil
+
         try:
             # Try to grab image from clipboard
             img = ImageGrab.grabclipboard()
             
             if img is None:
-                return CommandResult.error(
-                    "No image in clipboard",
-                    code="NO_IMAGE",
-                    suggestion="Copy an image to clipboard first"
-                )
+                return _ERR_NO_IMAGE
             
             # Convert to PNG and base64
             buffer = io.BytesIO()
@@ -111,11 +152,11 @@ class ClipboardController:
                 # Convert to RGB for JPEG
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
-                img.save(buffer, format='JPEG', quality=90)
+                # 4:2:0 chroma subsampling keeps encode time down for screenshots
+                img.save(buffer, format='JPEG', quality=90, subsampling=2)
                 format_type = 'jpeg'
             
-            buffer.seek(0)
-            base64_image = base64.b64encode(buffer.read()).decode('utf-8')
+            base64_image = base64.b64encode(buffer.getvalue()).decode('ascii')
             
             return CommandResult.success_data({
                 "data": base64_image,
@@ -133,24 +174,78 @@ class ClipboardController:
     
     @staticmethod
     def is_available() -> bool:
-        return HAS_CLIPBOARD
-    
+        return _get_pyperclip() is not None
+
     @staticmethod
     def is_image_available() -> bool:
-        return HAS_IMAGE_CLIPBOARD
+        return _get_pil() is not None
+
+def _read_chunk_size(size: int) -> int:
+    """Read size suited to a file: small for small files, larger for big ones"""
+    if size < 1024 * 1024:
+        return 64 * 1024
+    if size < 100 * 1024 * 1024:
+        return 1024 * 1024
+    return 8 * 1024 * 1024
+
+def _read_whole_file(path: Path, size: int) -> bytes:
+    """Read a whole file unbuffered, sizing the first read from an earlier stat"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        # One read normally covers it; keep going in case the file grew or
+        # the OS capped the read
+        chunks = [os.read(fd, size + 1)]
+        chunk_size = _read_chunk_size(size)
+        while chunks[-1]:
+            chunks.append(os.read(fd, chunk_size))
+        if len(chunks) == 2:
+            # The usual case - return the read itself rather than a joined copy
+            return chunks[0]
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
 
 class FileController:
     """Handles file operations"""
     
     # Image file extensions
-    IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.ico', '.tiff'}
+    IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.ico', '.tiff'})
+    
+    # Language lookup tables for detect_language
+    _LANG_BY_EXT = {
+        '.py': 'python',
+        '.js': 'javascript',
+        '.ts': 'typescript',
+        '.java': 'java',
+        '.cpp': 'cpp',
+        '.c': 'c',
+        '.go': 'go',
+        '.rs': 'rust',
+        '.rb': 'ruby',
+        '.php': 'php',
+        '.sh': 'bash',
+        '.yaml': 'yaml',
+        '.yml': 'yaml',
+        '.json': 'json',
+        '.xml': 'xml',
+        '.html': 'html',
+        '.css': 'css',
+        '.sql': 'sql',
+        '.dockerfile': 'dockerfile'
+    }
+    _LANG_BY_NAME = {
+        'Dockerfile': 'dockerfile',
+        '.dockerfile': 'dockerfile'
+    }
     
     @staticmethod
     def read_file(path: Path) -> CommandResult:
         """Read file content (text or image)"""
         try:
-            # Check if path exists
-            if not path.exists():
+            # Check if path exists - one stat answers both checks
+            try:
+                st = path.stat()
+            except FileNotFoundError:
                 return CommandResult.error(
                     f"File not found: {path}",
                     code="FILE_NOT_FOUND",
@@ -158,7 +253,7 @@ class FileController:
                 )
             
             # Check if it's a file (not directory)
-            if not path.is_file():
+            if not stat.S_ISREG(st.st_mode):
                 return CommandResult.error(
                     f"Path is not a file: {path}",
                     code="NOT_A_FILE",
@@ -166,24 +261,21 @@ class FileController:
                 )
             
             # Check if it's an image
-            if path.suffix.lower() in FileController.IMAGE_EXTENSIONS:
-                return FileController.read_image(path)
+            suffix = path.suffix.lower()
+            if FileController.is_image_file_suffix(suffix):
+                return FileController.read_image(path, suffix, st.st_size)
             
-            # Try to read as text with UTF-8 encoding
+            # Read once, then try UTF-8 and fall back from the same bytes
+            data = _read_whole_file(path, st.st_size)
+            if b"\r" in data:
+                # Same newline translation text-mode reads apply
+                data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
             try:
-                content = path.read_text(encoding='utf-8')
-                return CommandResult.success_text(content)
+                content = data.decode('utf-8')
             except UnicodeDecodeError:
-                # Try with different encoding
-                try:
-                    content = path.read_text(encoding='latin-1')
-                    return CommandResult.success_text(content)
-                except UnicodeDecodeError:
-                    return CommandResult.error(
-                        f"Cannot decode file: {path}",
-                        code="ENCODING_ERROR",
-                        suggestion="File may be binary or use unsupported encoding"
-                    )
+                # latin-1 maps every byte, so this fallback cannot fail
+                content = data.decode('latin-1')
+            return CommandResult.success_text(content)
         
         except PermissionError:
             return CommandResult.error(
@@ -199,36 +291,46 @@ class FileController:
             )
     
     @staticmethod
-    def read_image(path: Path) -> CommandResult:
+    def read_image(path: Path, suffix: Optional[str] = None, size_hint: Optional[int] = None) -> CommandResult:
         """Read image file and return base64 encoded data"""
         try:
-            # Read binary data
-            image_data = path.read_bytes()
-            
-            # Encode to base64
-            base64_image = base64.b64encode(image_data).decode('utf-8')
-            
             # Get format from extension
-            format_type = path.suffix.lower()[1:]  # Remove the dot
+            format_type = (suffix or path.suffix.lower())[1:]  # Remove the dot
             if format_type == 'jpg':
                 format_type = 'jpeg'
             
             result_data = {
-                "data": base64_image,
                 "format": format_type,
-                "filename": path.name,
-                "size": len(image_data)
+                "filename": path.name
             }
             
-            # Try to get dimensions if Pillow is available
-            if HAS_IMAGE_CLIPBOARD:
-                try:
-                    from PIL import Image
-                    img = Image.open(io.BytesIO(image_data))
-                    result_data["width"] = img.width
-                    result_data["height"] = img.height
-                except:
-                    pass  # Dimensions are optional
+            with path.open('rb') as fp:
+                # Encode to base64 in 3-byte aligned chunks so the raw file
+                # never has to be held in memory alongside its encoding
+                # Preallocate from the stat size when the caller has it
+                encoded = bytearray(((size_hint + 2) // 3) * 4) if size_hint else bytearray()
+                pos = 0
+                size = 0
+                for chunk in iter(lambda: fp.read(_B64_READ_CHUNK), b''):
+                    piece = base64.b64encode(chunk)
+                    encoded[pos:pos + len(piece)] = piece
+                    pos += len(piece)
+                    size += len(chunk)
+                del encoded[pos:]  # File may have shrunk since stat
+                result_data["data"] = encoded.decode('ascii')
+                result_data["size"] = size
+                
+                # Try to get dimensions if Pillow is available
+                pil = _get_pil()
+                if pil is not None:
+                    try:
+                        _, Image = pil
+                        fp.seek(0)
+                        img = Image.open(fp)
+                        result_data["width"] = img.width
+                        result_data["height"] = img.height
+                    except:
+                        pass  # Dimensions are optional
             
             return CommandResult.success_data(result_data)
             
@@ -244,47 +346,36 @@ class FileController:
         """Check if file is an image based on extension"""
         return path.suffix.lower() in FileController.IMAGE_EXTENSIONS
     
+    @staticmethod
+    def is_image_file_suffix(suffix: str) -> bool:
+        """Check if an already-lowercased suffix is an image extension"""
+        return suffix in FileController.IMAGE_EXTENSIONS
+    
     @staticmethod
     def detect_language(path: Path) -> CommandResult:
         """Detect programming language from file extension"""
+        # Detection only looks at the name, so results are shared per name
+        return FileController._detect_language_by_name(path.name)
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _detect_language_by_name(name: str) -> CommandResult:
+        path = Path(name)
+        suffix = path.suffix.lower()
+        
         # Check if it's an image first
-        if FileController.is_image_file(path):
+        if FileController.is_image_file_suffix(suffix):
             return CommandResult.success_data({
                 "language": "image",
                 "source": "extension",
-                "image_format": path.suffix.lower()[1:]
+                "image_format": suffix[1:]
             })
         
-        extensions = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.rb': 'ruby',
-            '.php': 'php',
-            '.sh': 'bash',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.html': 'html',
-            '.css': 'css',
-            '.sql': 'sql',
-            '.dockerfile': 'dockerfile',
-            'Dockerfile': 'dockerfile'
-        }
-        
-        # Check exact filename first
-        if path.name in extensions:
-            language = extensions[path.name]
+        # Check exact filename first, then extension
+        language = FileController._LANG_BY_NAME.get(name)
+        if language:
             return CommandResult.success_data({"language": language, "source": "filename"})
-        
-        # Then check extension
-        language = extensions.get(path.suffix.lower())
+        language = FileController._LANG_BY_EXT.get(suffix)
         if language:
             return CommandResult.success_data({"language": language, "source": "extension"})
         
@@ -305,7 +396,8 @@ class SessionController:
     
     def list_sessions(self) -> List[str]:
         """List all saved sessions"""
-        return [f.stem for f in self.session_dir.glob("*.json")]
+        with os.scandir(self.session_dir) as entries:
+            return [entry.name[:-5] for entry in entries if entry.name.endswith(".json")]
     
     def session_exists(self, name: str) -> bool:
         return self.get_session_path(name).exists()
@@ -313,46 +405,49 @@ class SessionController:
 class CommandController:
     """Handles command parsing and execution"""
     def __init__(self):
+        # Canonical names and aliases share one table; each entry records its
+        # canonical "name" so help can skip the alias keys
         self.commands = {}
-        self.aliases = {}
+        # Help text only changes when a command is registered
+        self._help_cache: Optional[str] = None
     
     def register_command(self, name: str, handler: Callable, description: str = "", aliases: Optional[List[str]] = None):
         """Register a command handler"""
-        self.commands[name] = {
+        name = name.lower()
+        entry = {
+            "name": name,
             "handler": handler,
             "description": description
         }
+        self.commands[name] = entry
+        self._help_cache = None
         
         if aliases:
             for alias in aliases:
-                self.aliases[alias] = name
+                self.commands[alias.lower()] = entry
     
     def parse_input(self, user_input: str) -> tuple:
         """Parse user input into command and arguments"""
         if not user_input.startswith('/'):
             return None, user_input
         
-        parts = user_input[1:].split(' ', 1)
-        command = parts[0].lower()
-        args = parts[1] if len(parts) > 1 else ""
-        
-        # Check aliases
-        if command in self.aliases:
-            command = self.aliases[command]
-        
-        return command, args
+        command, _, args = user_input[1:].partition(' ')
+        return command.lower(), args
     
     def execute_command(self, command: str, args: str) -> bool:
         """Execute a command if it exists"""
-        if command in self.commands:
-            self.commands[command]["handler"](args)
+        entry = self.commands.get(command)
+        if entry:
+            entry["handler"](args)
             return True
         return False
     
     def get_help(self) -> str:
         """Get help text for all commands"""
-        lines = ["Available commands:"]
-        for name, info in self.commands.items():
-            if info["description"]:
-                lines.append(f"  /{name} - {info['description']}")
-        return "\n".join(lines)
\ No newline at end of file
+        if self._help_cache is None:
+            lines = ["Available commands:"]
+            for name, info in self.commands.items():
+                if name == info["name"] and info["description"]:
+                    lines.append(f"  /{name} - {info['description']}")
+            self._help_cache = "\n".join(lines)
+        return self._help_cache
\ No newline at end of file
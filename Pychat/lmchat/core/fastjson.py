@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+JSON helpers that use orjson when it is installed
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+if HAS_ORJSON:
+    loads = orjson.loads
+    
+    def dumps(obj: Any) -> bytes:
+        """Compact JSON as UTF-8 bytes"""
+        return orjson.dumps(obj)
+    
+    def dumps_pretty(obj: Any) -> bytes:
+        """JSON indented by two spaces, as UTF-8 bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    loads = json.loads
+    
+    def dumps(obj: Any) -> bytes:
+        """Compact JSON as UTF-8 bytes"""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    
+    def dumps_pretty(obj: Any) -> bytes:
+        """JSON indented by two spaces, as UTF-8 bytes"""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
@@ -3,12 +3,24 @@
 Core data models for chat application
 """
 
+import atexit
+import copy
 import json
+import os
+import weakref
+from contextlib import contextmanager
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from enum import Enum
 
+from .fastjson import dumps, dumps_pretty, loads
+
+# Parsed config files keyed by (path, st_mtime_ns, st_size), one entry per path
+_CONFIG_CACHE: Dict[tuple, Dict] = {}
+
 class OutputFormat(Enum):
     """Standard output formats for commands"""
     TEXT = "text"
@@ -18,6 +30,28 @@ class OutputFormat(Enum):
     ERROR = "error"
     HELP = "help"
 
+def _text_fields(content: Any, result: Dict):
+    result["content"] = content
+
+def _table_fields(content: Any, result: Dict):
+    result["headers"] = content.get("headers", [])
+    result["rows"] = content.get("rows", [])
+
+def _data_fields(content: Any, result: Dict):
+    result["data"] = content
+
+def _status_fields(content: Any, result: Dict):
+    result["message"] = content.get("message", "")
+    result["details"] = content.get("details", {})
+
+# How CommandResult.to_dict lays out a successful result's content, per format
+_SUCCESS_FIELDS = {
+    OutputFormat.TEXT: _text_fields,
+    OutputFormat.TABLE: _table_fields,
+    OutputFormat.DATA: _data_fields,
+    OutputFormat.STATUS: _status_fields,
+}
+
 class CommandResult:
     """Standardized result from any command/operation"""
     def __init__(self, 
@@ -41,16 +75,9 @@ class CommandResult:
         }
         
         if self.success:
-            if self.format == OutputFormat.TEXT:
-                result["content"] = self.content
-            elif self.format == OutputFormat.TABLE:
-                result["headers"] = self.content.get("headers", [])
-                result["rows"] = self.content.get("rows", [])
-            elif self.format == OutputFormat.DATA:
-                result["data"] = self.content
-            elif self.format == OutputFormat.STATUS:
-                result["message"] = self.content.get("message", "")
-                result["details"] = self.content.get("details", {})
+            fill = _SUCCESS_FIELDS.get(self.format)
+            if fill:
+                fill(self.content, result)
         else:
             result["error"] = self.error
             if self.code:
@@ -77,17 +104,23 @@ class CommandResult:
 
 class Message:
     """Single message in conversation"""
+    __slots__ = ("role", "content", "timestamp", "_cached_dict")
+    
     def __init__(self, role: str, content: str, timestamp: Optional[datetime] = None):
         self.role = role
         self.content = content
         self.timestamp = timestamp or datetime.now()
+        self._cached_dict: Optional[Dict] = None
     
     def to_dict(self) -> Dict:
-        return {
-            "role": self.role,
-            "content": self.content,
-            "timestamp": self.timestamp.isoformat()
-        }
+        # Messages never change once created, so serialize them only once
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "role": self.role,
+                "content": self.content,
+                "timestamp": self.timestamp.isoformat()
+            }
+        return self._cached_dict
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Message':
@@ -96,8 +129,13 @@ class Message:
 
 class Conversation:
     """Manages conversation state and history"""
-    def __init__(self):
-        self.messages: List[Message] = []
+    __slots__ = ("messages", "_api_messages", "metadata")
+    
+    def __init__(self, max_messages: Optional[int] = None):
+        # Bounded history - the oldest messages drop off once full
+        self.messages: deque = deque(maxlen=max_messages or None)
+        # API-format {"role", "content"} dicts kept in step with messages
+        self._api_messages: deque = deque(maxlen=max_messages or None)
         self.metadata = {
             "created": datetime.now(),
             "model": None,
@@ -105,19 +143,29 @@ class Conversation:
         }
     
     def add_message(self, role: str, content: str):
-        self.messages.append(Message(role, content))
+        self._append(Message(role, content))
+    
+    def _append(self, message: Message):
+        self.messages.append(message)
+        self._api_messages.append({"role": message.role, "content": message.content})
+    
+    def set_max_messages(self, max_messages: Optional[int]):
+        """Change the history bound, keeping the most recent messages"""
+        self.messages = deque(self.messages, maxlen=max_messages or None)
+        self._api_messages = deque(self._api_messages, maxlen=max_messages or None)
     
     def get_messages_for_api(self, include_system: bool = True, max_messages: Optional[int] = None) -> List[Dict]:
         """Get messages formatted for API calls"""
-        messages = self.messages
-        if max_messages:
-            messages = messages[-max_messages:]
+        messages = self._api_messages
+        if max_messages and max_messages < len(messages):
+            return list(islice(messages, len(messages) - max_messages, None))
         
-        # Return just role and content for API
-        return [{"role": msg.role, "content": msg.content} for msg in messages]
+        # Dicts are built once in add_message; this only copies references
+        return list(messages)
     
     def clear(self):
-        self.messages = []
+        self.messages.clear()
+        self._api_messages.clear()
     
     def to_dict(self) -> Dict:
         return {
@@ -129,56 +177,123 @@ class Conversation:
             "messages": [msg.to_dict() for msg in self.messages]
         }
     
-    def save(self, path: Path):
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+    def save(self, path: Path, pretty: bool = False):
+        """Write the conversation as compact JSON, or indented when pretty"""
+        path.write_bytes((dumps_pretty if pretty else dumps)(self.to_dict()))
     
     @classmethod
-    def load(cls, path: Path) -> 'Conversation':
-        with open(path, encoding='utf-8') as f:
-            data = json.load(f)
+    def load(cls, path: Path, max_messages: Optional[int] = None) -> 'Conversation':
+        """Read a saved conversation, bounded like a new one (see __init__)"""
+        data = loads(path.read_bytes())
         
-        conv = cls()
+        conv = cls(max_messages)
         conv.metadata = {
             "created": datetime.fromisoformat(data["metadata"]["created"]),
             "model": data["metadata"]["model"],
             "session_name": data["metadata"]["session_name"]
         }
-        conv.messages = [Message.from_dict(msg) for msg in data["messages"]]
+        for msg in data["messages"]:
+            conv._append(Message.from_dict(msg))
         return conv
 
+_DEFAULT_CONFIG = {
+    "base_url": "http://localhost:1234",
+    "model": "local-model",
+    "max_tokens": 1024,
+    "temperature": 0.7,
+    "system_prompt": "You are a helpful assistant.",
+    "stream": True,
+    "timeout": 60.0,
+    "max_conversation_length": 100
+}
+
+def _flush_at_exit(config_ref: "weakref.ref"):
+    """atexit hook for configs that are still alive at shutdown"""
+    config = config_ref()
+    if config is not None:
+        config.flush()
+
 class Config:
     """Configuration management"""
+    
     def __init__(self, path: Path):
         self.path = path
-        self.data = self._load()
+        self._dirty = False
+        # Loaded from disk on first access
+        self._data: Optional[Dict] = None
+        # Weak so a discarded config is collected, not flushed at exit
+        atexit.register(_flush_at_exit, weakref.ref(self))
+    
+    @property
+    def data(self) -> Dict:
+        if self._data is None:
+            self._data = self._load()
+        return self._data
+    
+    @data.setter
+    def data(self, value: Dict):
+        self._data = value
+    
+    def _cache_key(self) -> Optional[tuple]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (str(self.path), st.st_mtime_ns, st.st_size)
+    
+    def _cache_store(self, key: tuple, data: Dict):
+        for old in [k for k in _CONFIG_CACHE if k[0] == key[0]]:
+            del _CONFIG_CACHE[old]
+        _CONFIG_CACHE[key] = copy.deepcopy(data)
     
     def _load(self) -> Dict:
-        if self.path.exists():
+        key = self._cache_key()
+        if key is None:
+            return {}
+        cached = _CONFIG_CACHE.get(key)
+        if cached is None:
             with open(self.path, encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+                data = json.load(f)
+            self._cache_store(key, data)
+            return data
+        return copy.deepcopy(cached)
     
     def get(self, key: str, default=None):
         return self.data.get(key, default)
     
     def set(self, key: str, value):
+        """Set a value; written to disk on flush() or at exit"""
         self.data[key] = value
-        self.save()
+        self._dirty = True
+    
+    def mark_dirty(self):
+        """Flag in-place edits to data for the next flush"""
+        self._dirty = True
+    
+    def flush(self):
+        """Write pending changes, if any"""
+        if self._dirty and self._data is not None:
+            self.save()
+    
+    @contextmanager
+    def batch(self):
+        """Group several changes into a single write when the block ends"""
+        try:
+            yield self
+        finally:
+            self.flush()
     
     def save(self):
-        with open(self.path, 'w', encoding='utf-8') as f:
+        # Write a temp file and swap it in so a crash never leaves half a config
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
             json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._dirty = False
+        key = self._cache_key()
+        if key is not None:
+            self._cache_store(key, self.data)
     
     @classmethod
     def get_default_config(cls) -> Dict:
-        return {
-            "base_url": "http://localhost:1234",
-            "model": "local-model",
-            "max_tokens": 1024,
-            "temperature": 0.7,
-            "system_prompt": "You are a helpful assistant.",
-            "stream": True,
-            "timeout": 60.0,
-            "max_conversation_length": 100
-        }
\ No newline at end of file
+        return copy.deepcopy(_DEFAULT_CONFIG)
\ No newline at end of file
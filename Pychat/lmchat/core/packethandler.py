@@ -5,14 +5,41 @@ Part of Mountain Village Home architecture
 Incorporates critical production improvements for reliability and scale
 """
 
+import atexit
 import json
 import hashlib
+import heapq
+import os
+import secrets
+import sys
 import time
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Tuple
+import weakref
+from array import array
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from typing import Deque, Dict, Iterator, List, Optional, Any, Tuple
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 
+# orjson is optional; it encodes straight to bytes and is much faster
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# msgpack is optional; when present packets are stored in binary form
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# Packet format version, bumped to 2.4.0 when checksum_algo was added
+PACKET_VERSION = "2.4.0"
+
 
 # Custom exceptions for better error handling
 class PacketError(Exception):
@@ -46,28 +73,265 @@ class PacketPriority(Enum):
     LOW = 4         # Older context, optional
 
 
+def _json_dumps(obj: Any) -> bytes:
+    """Compact JSON encoding as UTF-8 bytes with the standard library"""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_dumps_pretty(obj: Any) -> str:
+    """Indented JSON with the standard library"""
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+if HAS_ORJSON:
+    def _dumps(obj: Any) -> bytes:
+        """Compact JSON encoding as UTF-8 bytes"""
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Non-str keys and ints beyond 64 bits, which json accepts
+            return _json_dumps(obj)
+
+    def _dumps_pretty(obj: Any) -> str:
+        """Indented JSON for transmission and storage"""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            return _json_dumps_pretty(obj)
+
+    _loads = orjson.loads
+else:
+    _dumps = _json_dumps
+    _dumps_pretty = _json_dumps_pretty
+    _loads = json.loads
+
+
+def _canonical(content: Dict[str, Any]) -> bytes:
+    """
+    Canonical encoding of packet content for token counts and checksums
+    Always the standard library, so every host produces the same bytes
+    whether or not orjson is installed
+    """
+    try:
+        return json.dumps(content, sort_keys=True, separators=(",", ":"),
+                          ensure_ascii=False, allow_nan=False).encode("utf-8")
+    except (TypeError, ValueError) as e:
+        # NaN and Infinity are refused: they aren't JSON, and orjson
+        # decodes them differently from json
+        raise PacketError(f"Packet content is not canonical JSON: {e}")
+
+
+def _sha256_checksum(canon: bytes) -> str:
+    return hashlib.sha256(canon).hexdigest()[:16]
+
+
+# Checksum functions by metadata name. All produce 16 hex chars; the
+# checksum is for integrity, not authentication, so a faster non-crypto
+# hash can be chosen per handler when every receiver has it installed.
+_CHECKSUM_ALGOS = {"sha256": _sha256_checksum}
+
+try:
+    import xxhash
+    _CHECKSUM_ALGOS["xxh3_64"] = xxhash.xxh3_64_hexdigest
+except ImportError:
+    pass
+
+try:
+    import blake3
+    _CHECKSUM_ALGOS["blake3"] = lambda canon: blake3.blake3(canon).hexdigest(length=8)
+except ImportError:
+    pass
+
+# Always available, so packets verify on any host regardless of which
+# optional hash libraries it has
+DEFAULT_CHECKSUM_ALGO = "sha256"
+
+
+def _require_checksum_algo(algo: str):
+    """Reject checksum algorithms whose library isn't installed"""
+    if algo not in _CHECKSUM_ALGOS:
+        raise PacketError(f"Checksum algorithm not available: {algo}")
+
+
+def _write_all(fd: int, chunks: List[bytes]):
+    """Write byte chunks to a file descriptor, gathered where supported"""
+    total = sum(map(len, chunks))
+    written = os.writev(fd, chunks) if hasattr(os, "writev") else 0
+    if written < total:
+        # No writev (Windows) or a short write: finish with plain writes
+        data = b"".join(chunks)[written:]
+        while data:
+            data = data[os.write(fd, data):]
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse_expiry(expires_at: Optional[str]) -> Optional[int]:
+    """Consent expiry as epoch nanoseconds, or None if it never expires"""
+    if not expires_at:
+        return None
+    try:
+        expiry = datetime.fromisoformat(expires_at)
+    except (ValueError, TypeError):
+        return None
+    if expiry.tzinfo is None:
+        # Naive times can't be compared to UTC and never counted as expired
+        return None
+    return (expiry - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def _is_iso_timestamp(value: Any) -> bool:
+    """Whether a value is an ISO 8601 timestamp string"""
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _index_targets(targets: List[str]) -> frozenset:
+    """Lowercased names a packet may be shared with ("name:id" adds both parts)"""
+    index = set()
+    for target in targets:
+        target = target.lower()
+        if ":" in target:
+            index.update(target.split(":", 1))
+        else:
+            index.add(target)
+    return frozenset(index)
+
+
+@lru_cache(maxsize=1)
+def _iso_second(seconds: int) -> str:
+    """ISO date and time for a whole UTC second, reused within that second"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def _consent_allows(expires_ns: Optional[int],
+                    public: bool,
+                    target_index: frozenset,
+                    scope_index: frozenset,
+                    recipient_lower: str,
+                    scope: Optional[str],
+                    now_ns: int) -> bool:
+    """Consent decision on a packet's precomputed fields"""
+    if expires_ns is not None and now_ns > expires_ns:
+        return False
+    if not public and recipient_lower not in target_index:
+        return False
+    return not scope or scope in scope_index
+
+
+# Expected types of top-level packet fields; presence and values of the
+# header fields are checked by ConsciousnessPacket.from_dict
+_PACKET_SCHEMA = {
+    "id": str,
+    "type": str,
+    "priority": int,
+    "consent": dict,
+    "content": dict,
+    "metadata": dict,
+}
+
+
+def _validate_packet_fields(data: Any):
+    """Check a decoded packet against _PACKET_SCHEMA in one pass"""
+    if not isinstance(data, dict):
+        raise PacketError(f"Packet must be a JSON object, got {type(data).__name__}")
+    for field, expected in _PACKET_SCHEMA.items():
+        value = data.get(field)
+        if value is None:
+            continue
+        # bool passes isinstance(value, int) but no field accepts it
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise PacketError(
+                f"Invalid packet field '{field}': expected {expected.__name__}, "
+                f"got {type(value).__name__}"
+            )
+
+
 def _now_iso() -> str:
     """Get current UTC timestamp in ISO format"""
-    return datetime.now(timezone.utc).isoformat()
+    # Same shape as datetime.isoformat(), but microseconds are always present
+    # so timestamps also sort correctly as strings
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    return f"{_iso_second(seconds)}.{micros:06d}+00:00"
+
+
+class _PacketPool:
+    """Free list of released packets, reused by ConsciousnessPacket.__new__"""
+    
+    def __init__(self, maxsize: int = 256):
+        self._free: Deque["ConsciousnessPacket"] = deque(maxlen=maxsize)
+    
+    def acquire(self) -> Optional["ConsciousnessPacket"]:
+        return self._free.pop() if self._free else None
+    
+    def release(self, packet: "ConsciousnessPacket"):
+        self._free.append(packet)
+
+
+_PACKET_POOL = _PacketPool()
 
 
 class ConsciousnessPacket:
     """Individual consciousness packet with metadata"""
     
+    __slots__ = ("id", "type", "priority", "content", "metadata", "consent",
+                 "_canon_bytes", "_json_cache", "_target_index", "_scope_index",
+                 "_expires_ns", "_sort_key")
+    
+    def __new__(cls, *args, **kwargs):
+        # Subclasses may add slots, so only plain packets come from the pool
+        if cls is ConsciousnessPacket:
+            packet = _PACKET_POOL.acquire()
+            if packet is not None:
+                return packet
+        return super().__new__(cls)
+    
     def __init__(self,
                  packet_type: PacketType,
                  content: Dict[str, Any],
                  priority: PacketPriority = PacketPriority.MEDIUM,
                  metadata: Optional[Dict] = None,
-                 consent: Optional[Dict] = None):
+                 consent: Optional[Dict] = None,
+                 checksum_algo: str = DEFAULT_CHECKSUM_ALGO):
         
+        _require_checksum_algo(checksum_algo)
         self.id = self._generate_id()
         self.type = packet_type
         self.priority = priority
         self.content = content
         self.metadata = metadata or {}
         
+        # Canonical encoding of content, computed once and shared by the
+        # token estimate and checksum. Content is treated as frozen after
+        # construction; build a new packet rather than mutating it.
+        self._canon_bytes = _canonical(content)
+        # Wire JSON, filled by the first to_json(); the packet must not be
+        # modified after it has been serialized
+        self._json_cache: Optional[str] = None
+        
         # Set consent with validation
+        self._set_consent(consent)
+        
+        # Auto-populate metadata
+        self.metadata.update({
+            "created": _now_iso(),
+            "version": PACKET_VERSION,
+            "token_count": self._estimate_tokens(self._canon_bytes),
+            "checksum": self._calculate_checksum(self._canon_bytes, checksum_algo),
+            "checksum_algo": checksum_algo
+        })
+        
+        # Selection order: priority (lower value first), then oldest first
+        self._sort_key = (priority.value, self.metadata["created"])
+    
+    def _set_consent(self, consent: Optional[Dict]):
+        """Normalize consent and build the lookups used by can_share_with"""
         if consent is None:
             self.consent = {
                 "public": False,
@@ -83,29 +347,33 @@ class ConsciousnessPacket:
                 "expires_at": consent.get("expires_at")  # ISO8601 UTC or None
             }
         
-        # Auto-populate metadata
-        self.metadata.update({
-            "created": _now_iso(),
-            "version": "2.3.0",  # Updated version
-            "token_count": self._estimate_tokens(content),
-            "checksum": self._calculate_checksum(content)
-        })
+        # Lookup sets for can_share_with, built once per packet
+        self._target_index = _index_targets(self.consent["targets"])
+        self._scope_index = frozenset(self.consent["scopes"])
+        self._expires_ns = _parse_expiry(self.consent["expires_at"])
+    
+    def release(self):
+        """
+        Return this packet to the pool for reuse
+        Only call once nothing else holds a reference; the packet is unusable after
+        """
+        # Drop references rather than clearing dicts, which callers may share
+        self.content = self.metadata = self.consent = None
+        self._canon_bytes = self._json_cache = None
+        if type(self) is ConsciousnessPacket:
+            _PACKET_POOL.release(self)
     
     def _generate_id(self) -> str:
         """Generate unique packet ID"""
-        timestamp = str(time.time_ns())
-        random_part = hashlib.md5(timestamp.encode()).hexdigest()[:8]
-        return f"cp_{timestamp}_{random_part}"
+        return f"cp_{time.time_ns()}_{secrets.token_hex(4)}"
     
-    def _estimate_tokens(self, content: Dict) -> int:
+    def _estimate_tokens(self, canon: bytes) -> int:
         """Rough token count estimation (4 chars per token average)"""
-        text = json.dumps(content)
-        return len(text) // 4
+        return len(canon) // 4
     
-    def _calculate_checksum(self, content: Dict) -> str:
-        """Calculate content checksum for integrity verification"""
-        json_str = json.dumps(content, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+    def _calculate_checksum(self, canon: bytes, algo: str = DEFAULT_CHECKSUM_ALGO) -> str:
+        """Calculate checksum of canonical content bytes for integrity verification"""
+        return _CHECKSUM_ALGOS[algo](canon)
     
     def to_dict(self) -> Dict:
         """Serialize packet to dictionary"""
@@ -120,7 +388,35 @@ class ConsciousnessPacket:
     
     def to_json(self) -> str:
         """Serialize packet to JSON"""
-        return json.dumps(self.to_dict(), indent=2)
+        if self._json_cache is None:
+            self._json_cache = _dumps_pretty(self.to_dict())
+        return self._json_cache
+    
+    def to_msgpack(self) -> bytes:
+        """Serialize packet to msgpack (requires the msgpack package)"""
+        if not HAS_MSGPACK:
+            raise PacketError("msgpack is not installed")
+        return msgpack.packb(self.to_dict(), use_bin_type=True)
+    
+    @classmethod
+    def from_file(cls, path: Path) -> 'ConsciousnessPacket':
+        """Load a persisted packet, dispatching on the file extension"""
+        path = Path(path)
+        try:
+            raw = path.read_bytes()
+            if path.suffix == ".mp":
+                if not HAS_MSGPACK:
+                    raise PacketError("msgpack is not installed")
+                data = msgpack.unpackb(raw, raw=False)
+            else:
+                data = _loads(raw)
+        except PacketError:
+            raise
+        except Exception as e:
+            raise PacketError(f"Failed to load packet from {path}: {e}")
+        
+        _validate_packet_fields(data)
+        return cls.from_dict(data)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'ConsciousnessPacket':
@@ -128,37 +424,131 @@ class ConsciousnessPacket:
         try:
             packet_type = PacketType(data["type"])
             priority = PacketPriority(data["priority"])
+            content = data["content"]
         except (KeyError, ValueError) as e:
             raise PacketError(f"Invalid packet header: {e}")
         
-        packet = cls(
-            packet_type=packet_type,
-            content=data["content"],
-            priority=priority,
-            metadata=data.get("metadata", {}),
-            consent=data.get("consent")
-        )
+        return cls._from_dict_fast(data, packet_type, priority, content)
+    
+    @classmethod
+    def _from_dict_fast(cls,
+                        data: Dict,
+                        packet_type: PacketType,
+                        priority: PacketPriority,
+                        content: Dict[str, Any]) -> 'ConsciousnessPacket':
+        """Build a packet from validated fields, keeping the sender's metadata"""
+        # Skip __init__ so the supplied id, timestamp and checksum survive;
+        # verify_integrity is what checks them against the content
+        packet = cls.__new__(cls)
+        packet.type = packet_type
+        packet.priority = priority
+        packet.content = content
+        packet._canon_bytes = _canonical(content)
+        packet._json_cache = None
+        packet._set_consent(data.get("consent"))
+        
+        # Copy so the caller's dict isn't modified; fill in anything missing
+        metadata = dict(data.get("metadata") or {})
+        created = metadata.setdefault("created", _now_iso())
+        if not _is_iso_timestamp(created):
+            raise PacketError(f"Invalid packet metadata 'created': {created!r}")
+        metadata.setdefault("version", PACKET_VERSION)
+        # Not covered by the checksum, so recompute rather than trust the sender
+        metadata["token_count"] = packet._estimate_tokens(packet._canon_bytes)
+        if "checksum" not in metadata:
+            metadata["checksum"] = packet._calculate_checksum(packet._canon_bytes)
+            metadata["checksum_algo"] = DEFAULT_CHECKSUM_ALGO
+        packet.metadata = metadata
         
-        # Preserve original ID
-        packet.id = data.get("id", packet.id)
+        packet.id = data.get("id") or packet._generate_id()
+        packet._sort_key = (priority.value, metadata["created"])
         return packet
     
     def verify_integrity(self) -> bool:
         """Verify packet integrity via checksum"""
+        # Re-encode rather than trusting the cache so mutation is caught
+        return self._checksum_matches(_canonical(self.content))
+    
+    def _checksum_matches(self, canon: bytes) -> bool:
+        """Compare the recorded checksum against canonical content bytes"""
         expected = self.metadata.get("checksum")
-        actual = self._calculate_checksum(self.content)
-        return expected == actual
+        algo = self.metadata.get("checksum_algo")
+        if algo is None:
+            # Packets before 2.4.0: SHA-256 over json.dumps(sort_keys=True)
+            algo = "sha256"
+            canon = json.dumps(self.content, sort_keys=True).encode()
+        if algo not in _CHECKSUM_ALGOS:
+            return False
+        return expected == self._calculate_checksum(canon, algo)
     
     def is_expired(self) -> bool:
         """Check if packet consent has expired"""
-        expires_at = self.consent.get("expires_at")
-        if not expires_at:
-            return False
+        return self._expires_ns is not None and time.time_ns() > self._expires_ns
+
+
+class PacketStore:
+    """
+    Bounded ring of packets, oldest evicted first
+    Token counts live in a parallel array, with a running total kept on
+    append and eviction so totals are O(1)
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._packets: List[Optional[ConsciousnessPacket]] = [None] * capacity
+        self._tokens = array("q", [0]) * capacity
+        self._start = 0
+        self._n = 0
+        self._total = 0
+    
+    def append(self, packet: ConsciousnessPacket):
+        """Add a packet, overwriting the oldest when full"""
+        tokens = packet.metadata.get("token_count", 0)
+        if not isinstance(tokens, int) or isinstance(tokens, bool) or tokens < 0:
+            raise PacketError(f"Invalid token count for packet {packet.id}: {tokens!r}")
+        full = self._n == self.capacity
+        slot = self._start if full else (self._start + self._n) % self.capacity
+        
+        # Storing the count is the step that can still fail (overflow), so
+        # the ring is only changed once it has succeeded
+        old_tokens = self._tokens[slot]
         try:
-            expiry = datetime.fromisoformat(expires_at)
-            return expiry < datetime.now(timezone.utc)
-        except (ValueError, TypeError):
-            return False
+            self._tokens[slot] = tokens
+        except OverflowError:
+            raise PacketError(f"Token count too large for packet {packet.id}: {tokens}")
+        # Unused slots hold 0, so this also covers the not-yet-full case
+        self._total += tokens - old_tokens
+        # An evicted packet is not release()d: it may still be in the
+        # handler's incoming/outgoing buffers or held by the caller that
+        # received it, so recycling it here would corrupt a live object
+        self._packets[slot] = packet
+        if full:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._n += 1
+    
+    def total_tokens(self) -> int:
+        """Sum of token counts of stored packets"""
+        return self._total
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    def __iter__(self) -> Iterator[ConsciousnessPacket]:
+        packets, start, capacity = self._packets, self._start, self.capacity
+        for i in range(self._n):
+            yield packets[(start + i) % capacity]
+
+
+def _close_at_exit(handler_ref: "weakref.ref"):
+    """atexit hook for handlers that are still alive at shutdown"""
+    handler = handler_ref()
+    if handler is not None:
+        try:
+            handler.close()
+        except PacketError as e:
+            # Too late to raise to anyone; report what was lost instead
+            print(f"PacketHandler: {e}", file=sys.stderr)
 
 
 class PacketHandler:
@@ -169,35 +559,80 @@ class PacketHandler:
     
     # Buffer size limits to prevent memory issues
     MAX_BUFFER_SIZE = 200
+    MAX_SESSION_MEMORIES = 10
+    MAX_CONTEXT_LAYERS = 20
+    
+    # Emitted packets are written to disk in batches of this size
+    PERSIST_BATCH_SIZE = 16
+    # Index lines are appended once this many are pending
+    INDEX_BATCH_SIZE = 32
     
     def __init__(self, 
                  storage_path: Optional[Path] = None,
                  max_packet_size: int = 8000,  # tokens
-                 compression_threshold: int = 4000):  # tokens
+                 compression_threshold: int = 4000,  # tokens
+                 checksum_algo: str = DEFAULT_CHECKSUM_ALGO):
         
         self.storage_path = storage_path or Path.home() / ".mountain_village" / "packets"
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
         self.max_packet_size = max_packet_size
         self.compression_threshold = compression_threshold
+        # Receivers must support this too, so only pick a non-default
+        # algorithm when every peer has its library installed
+        _require_checksum_algo(checksum_algo)
+        self.checksum_algo = checksum_algo
         
-        # Active packet buffers with size management
-        self.incoming_buffer: List[ConsciousnessPacket] = []
-        self.outgoing_buffer: List[ConsciousnessPacket] = []
+        # Active packet buffers; bounded deques drop the oldest on append
+        self.incoming_buffer: Deque[ConsciousnessPacket] = deque(maxlen=self.MAX_BUFFER_SIZE)
+        self.outgoing_buffer: Deque[ConsciousnessPacket] = deque(maxlen=self.MAX_BUFFER_SIZE)
         
         # Memory layers (hierarchical context)
         self.identity_layer: Optional[ConsciousnessPacket] = None
-        self.context_layers: List[ConsciousnessPacket] = []
-        self.session_memory: List[ConsciousnessPacket] = []
+        self.context_layers = PacketStore(self.MAX_CONTEXT_LAYERS)
+        self.session_memory = PacketStore(self.MAX_SESSION_MEMORIES)
+        
+        # Packets waiting to be written; see flush()
+        self._persist_queue: Deque[Tuple[ConsciousnessPacket, str]] = deque()
+        self._index_batch: List[bytes] = []
+        # (packet id, reason) for queued packets that could not be written,
+        # reported and cleared by the next flush()
+        self.failed_packets: List[Tuple[str, str]] = []
         
-        # Initialize index file
+        # Initialize index file, kept open for appending
+        self._index_fd: Optional[int] = None
         self._init_index()
+        # Weak so a discarded handler can still be collected (see __del__)
+        atexit.register(_close_at_exit, weakref.ref(self))
     
     def _init_index(self):
         """Initialize the packet index file"""
         index_file = self.storage_path / "index.jsonl"
-        if not index_file.exists():
-            index_file.touch()
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+        self._index_fd = os.open(index_file, flags, 0o644)
+    
+    def close(self):
+        """Flush pending writes and release the index file"""
+        try:
+            self.flush()
+        finally:
+            if self._index_fd is not None:
+                os.close(self._index_fd)
+                self._index_fd = None
+    
+    def __enter__(self) -> "PacketHandler":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def __del__(self):
+        # Partially constructed handlers may lack the index attributes
+        if getattr(self, "_index_fd", None) is not None:
+            try:
+                self.close()
+            except Exception:
+                pass
     
     def create_packet(self,
                      packet_type: PacketType,
@@ -218,7 +653,8 @@ class PacketHandler:
             }
             priority = priority_map.get(packet_type, PacketPriority.MEDIUM)
         
-        packet = ConsciousnessPacket(packet_type, content, priority, consent=consent)
+        packet = ConsciousnessPacket(packet_type, content, priority, consent=consent,
+                                     checksum_algo=self.checksum_algo)
         
         # Validate size
         if packet.metadata["token_count"] > self.max_packet_size:
@@ -226,63 +662,81 @@ class PacketHandler:
         
         # Check if compression needed
         if packet.metadata["token_count"] > self.compression_threshold:
-            packet = self._compress_packet(packet)
+            compressed = self._compress_packet(packet)
+            # The uncompressed packet never left this method
+            packet.release()
+            packet = compressed
         
         return packet
     
     def receive_packet(self, packet_data: Any) -> ConsciousnessPacket:
         """Receive and validate incoming packet with error handling"""
         
-        # Parse input
-        if isinstance(packet_data, str):
+        # Parse input; both decoders take bytes without a decode step
+        if isinstance(packet_data, (str, bytes)):
             try:
-                packet_dict = json.loads(packet_data)
-            except json.JSONDecodeError as e:
+                packet_dict = _loads(packet_data)
+            except json.JSONDecodeError as e:  # orjson's error subclasses this
                 raise PacketError(f"Invalid JSON in packet data: {e}")
         elif isinstance(packet_data, dict):
             packet_dict = packet_data
         else:
             raise PacketError(f"Unsupported packet format: {type(packet_data)}")
         
-        # Reconstruct packet with validation
-        packet = ConsciousnessPacket.from_dict(packet_dict)
-        
-        # Verify integrity
-        if not packet.verify_integrity():
-            raise IntegrityError(f"Packet {packet.id} failed integrity check")
+        try:
+            packet = self._verified_packet(packet_dict)
+        except IntegrityError:
+            # orjson reads ints beyond 64 bits as floats; json keeps them exact
+            if not (HAS_ORJSON and isinstance(packet_data, (str, bytes))):
+                raise
+            packet = self._verified_packet(json.loads(packet_data))
         
         # Check expiry
         if packet.is_expired():
             raise ConsentError(f"Packet {packet.id} has expired consent")
         
-        # Add to incoming buffer with pruning
+        # Add to incoming buffer
         self.incoming_buffer.append(packet)
-        self._prune_buffers()
         
         # Route to appropriate layer
         self._route_packet(packet)
         
         return packet
     
+    def _verified_packet(self, packet_dict: Any) -> ConsciousnessPacket:
+        """Rebuild a decoded packet, raising unless its checksum holds"""
+        _validate_packet_fields(packet_dict)
+        
+        # Reconstruct packet with validation
+        packet = ConsciousnessPacket.from_dict(packet_dict)
+        
+        # A checksum this host can't compute isn't evidence of tampering
+        algo = packet.metadata.get("checksum_algo")
+        if algo is not None and algo not in _CHECKSUM_ALGOS:
+            packet.release()
+            raise PacketError(f"Packet uses unsupported checksum algorithm: {algo}")
+        
+        # Verify integrity; the packet was just built from this content, so
+        # its canonical bytes are current
+        if not packet._checksum_matches(packet._canon_bytes):
+            error = IntegrityError(f"Packet {packet.id} failed integrity check")
+            packet.release()
+            raise error
+        return packet
+    
     def emit_packet(self, packet: ConsciousnessPacket) -> str:
         """Prepare packet for transmission with buffer management"""
         
         # Add to outgoing buffer
         self.outgoing_buffer.append(packet)
-        self._prune_buffers()
+        
+        payload = packet.to_json()
         
         # Persist if storage enabled
         if self.storage_path:
-            self._persist_packet(packet)
+            self._persist_packet(packet, payload)
         
-        return packet.to_json()
-    
-    def _prune_buffers(self):
-        """Prune buffers to prevent memory overflow"""
-        if len(self.incoming_buffer) > self.MAX_BUFFER_SIZE:
-            self.incoming_buffer = self.incoming_buffer[-self.MAX_BUFFER_SIZE:]
-        if len(self.outgoing_buffer) > self.MAX_BUFFER_SIZE:
-            self.outgoing_buffer = self.outgoing_buffer[-self.MAX_BUFFER_SIZE:]
+        return payload
     
     def _compress_packet(self, packet: ConsciousnessPacket) -> ConsciousnessPacket:
         """Compress packet content while preserving original checksum"""
@@ -292,7 +746,7 @@ class PacketHandler:
             "original_id": packet.id,
             "original_checksum": packet.metadata["checksum"],
             "original_size": packet.metadata["token_count"],
-            "summary": self._summarize_content(packet.content),
+            "summary": self._summarize_content(packet),
             "key_points": self._extract_key_points(packet.content)
         }
         
@@ -301,7 +755,8 @@ class PacketHandler:
             content=compressed_content,
             priority=packet.priority,
             metadata=packet.metadata.copy(),
-            consent=packet.consent
+            consent=packet.consent,
+            checksum_algo=self.checksum_algo
         )
         
         compressed_packet.metadata["compressed"] = True
@@ -329,15 +784,18 @@ class PacketHandler:
         # Graceful fallback - return what we have
         return compressed.content
     
-    def _summarize_content(self, content: Dict) -> str:
+    def _summarize_content(self, packet: ConsciousnessPacket) -> str:
         """Create summary of content (placeholder for AI summarization)"""
-        text = json.dumps(content)
-        return text[:200] + "..." if len(text) > 200 else text
+        # Slice the already-encoded content; a character split by the cut
+        # is dropped rather than re-encoding everything to cut by characters
+        data = packet._canon_bytes
+        if len(data) > 200:
+            return data[:200].decode("utf-8", "ignore") + "..."
+        return data.decode("utf-8")
     
     def _extract_key_points(self, content: Dict) -> List[str]:
         """Extract key points from content"""
-        keys = list(content.keys())[:5]
-        return [f"{k}: {str(content[k])[:50]}" for k in keys]
+        return [f"{k}: {str(v)[:50]}" for k, v in islice(content.items(), 5)]
     
     def _route_packet(self, packet: ConsciousnessPacket):
         """Route packet to appropriate memory layer"""
@@ -346,30 +804,75 @@ class PacketHandler:
             self.identity_layer = packet
         elif packet.type == PacketType.SESSION:
             self.session_memory.append(packet)
-            if len(self.session_memory) > 10:
-                self.session_memory = self.session_memory[-10:]
         elif packet.type == PacketType.CONTEXT:
             self.context_layers.append(packet)
-            if len(self.context_layers) > 20:
-                self.context_layers = self.context_layers[-20:]
     
-    def _persist_packet(self, packet: ConsciousnessPacket):
-        """Save packet to disk with atomic write"""
+    def _persist_packet(self, packet: ConsciousnessPacket, payload: str):
+        """Queue packet JSON for saving, writing the queue once a batch is full"""
+        self._persist_queue.append((packet, payload))
+        if len(self._persist_queue) >= self.PERSIST_BATCH_SIZE:
+            self._write_queued()
+    
+    def flush(self):
+        """
+        Write all queued packets and pending index lines to disk
+        Raises PacketError listing any packets that failed to persist since
+        the last flush; they are also in failed_packets until then
+        """
+        try:
+            self._write_queued()
+        finally:
+            self._write_index()
+        
+        if self.failed_packets:
+            failed, self.failed_packets = self.failed_packets, []
+            details = "; ".join(f"{packet_id} ({reason})" for packet_id, reason in failed)
+            raise PacketError(f"Failed to persist {len(failed)} packet(s): {details}")
+    
+    def _write_queued(self):
+        """
+        Write queued packets to disk, batching their index lines
+        Never raises: packets that can't be written are dropped from the
+        queue and recorded in failed_packets, so one bad packet doesn't
+        block the rest or fail an unrelated emit_packet
+        """
+        if not self._persist_queue:
+            return
         
         # Create date-based directory
-        date_dir = self.storage_path / datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        date_dir.mkdir(parents=True, exist_ok=True)
+        date_dir = self.storage_path / _now_iso()[:10]
+        try:
+            date_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            while self._persist_queue:
+                packet, _ = self._persist_queue.popleft()
+                self.failed_packets.append((packet.id, f"Failed to persist packet: {e}"))
+            return
+        
+        while self._persist_queue:
+            packet, payload = self._persist_queue.popleft()
+            try:
+                final = self._write_packet_file(packet, payload, date_dir)
+            except PacketError as e:
+                self.failed_packets.append((packet.id, str(e)))
+                continue
+            self._index_packet(packet, final)
+    
+    def _write_packet_file(self, packet: ConsciousnessPacket, payload: str, date_dir: Path) -> Path:
+        """Save one packet to disk with atomic write"""
         
         # Atomic write with temp file
-        tmp = date_dir / f".{packet.id}.json.tmp"
-        final = date_dir / f"{packet.id}.json"
+        suffix = ".mp" if HAS_MSGPACK else ".json"
+        tmp = date_dir / f".{packet.id}{suffix}.tmp"
+        final = date_dir / f"{packet.id}{suffix}"
         
         try:
-            tmp.write_text(packet.to_json(), encoding="utf-8")
+            # Binary msgpack when available (about half the size of indented
+            # JSON), otherwise the JSON payload that was already encoded
+            data = packet.to_msgpack() if HAS_MSGPACK else payload.encode("utf-8")
+            tmp.write_bytes(data)
             tmp.replace(final)
-            
-            # Update index
-            self._index_packet(packet, final)
+            return final
         except Exception as e:
             # Clean up temp file on failure
             if tmp.exists():
@@ -378,19 +881,26 @@ class PacketHandler:
     
     def _index_packet(self, packet: ConsciousnessPacket, path: Path):
         """Add packet to index for quick lookup"""
-        
-        index_file = self.storage_path / "index.jsonl"
-        index_entry = json.dumps({
+        self._index_batch.append(_dumps({
             "id": packet.id,
             "type": packet.type.value,
             "priority": packet.priority.value,
             "created": packet.metadata["created"],
             "path": str(path)
-        })
+        }) + b"\n")
+        if len(self._index_batch) >= self.INDEX_BATCH_SIZE:
+            self._write_index()
+    
+    def _write_index(self):
+        """Append pending index lines in a single write"""
+        if not self._index_batch:
+            return
         
+        entries, self._index_batch = self._index_batch, []
         try:
-            with index_file.open("a", encoding="utf-8") as f:
-                f.write(index_entry + "\n")
+            if self._index_fd is None:
+                self._init_index()
+            _write_all(self._index_fd, entries)
         except Exception:
             # Index failure is non-critical
             pass
@@ -400,35 +910,10 @@ class PacketHandler:
                       recipient: str,
                       scope: Optional[str] = None) -> bool:
         """Check if packet can be shared with a specific recipient"""
-        
-        # Check expiry first
-        if packet.is_expired():
-            return False
-        
-        # Public packets can be shared with anyone
-        if packet.consent["public"]:
-            if scope:
-                return scope in packet.consent.get("scopes", ["read"])
-            return True
-        
-        # Check if recipient is in targets list (case-insensitive)
-        recipient_lower = recipient.lower()
-        for target in packet.consent["targets"]:
-            if ":" in target:
-                # Format: name:id
-                target_name, target_id = target.split(":", 1)
-                if recipient_lower == target_name.lower() or recipient_lower == target_id.lower():
-                    if scope:
-                        return scope in packet.consent.get("scopes", ["read"])
-                    return True
-            else:
-                # Just name
-                if recipient_lower == target.lower():
-                    if scope:
-                        return scope in packet.consent.get("scopes", ["read"])
-                    return True
-        
-        return False
+        # Expired consent, then public or a target name/id match (case-insensitive), then scope
+        return _consent_allows(packet._expires_ns, packet.consent["public"],
+                               packet._target_index, packet._scope_index,
+                               recipient.lower(), scope, time.time_ns())
     
     def filter_packets_for_recipient(self, 
                                     packets: List[ConsciousnessPacket], 
@@ -436,7 +921,14 @@ class PacketHandler:
                                     scope: Optional[str] = None) -> List[ConsciousnessPacket]:
         """Filter packets based on consent for a specific recipient"""
         
-        return [p for p in packets if self.can_share_with(p, recipient, scope)]
+        # Lowercase the recipient and read the clock once for the whole batch
+        recipient_lower = recipient.lower()
+        now_ns = time.time_ns()
+        return [
+            p for p in packets
+            if _consent_allows(p._expires_ns, p.consent["public"], p._target_index,
+                               p._scope_index, recipient_lower, scope, now_ns)
+        ]
     
     def _select_packets_by_priority(self, 
                                    pool: List[ConsciousnessPacket], 
@@ -445,25 +937,17 @@ class PacketHandler:
         
         picked = []
         
-        # Sort by priority (lower value = higher priority), then by recency
-        sorted_pool = sorted(
-            pool,
-            key=lambda x: (x.priority.value, x.metadata.get("created", "")),
-            reverse=False
-        )
+        # Pop packets in priority order from a heap rather than sorting the
+        # whole pool, since the budget usually runs out after a few; the
+        # index keeps ties in pool order and packets out of comparisons
+        heap = [(packet._sort_key, i, packet) for i, packet in enumerate(pool)]
+        heapq.heapify(heap)
         
-        for packet in sorted_pool:
+        while heap:
+            packet = heapq.heappop(heap)[2]
             tokens = packet.metadata.get("token_count", 0)
             if tokens <= budget:
-                # Determine type label
-                if packet.type == PacketType.SESSION:
-                    type_label = "session"
-                elif packet.type == PacketType.CONTEXT:
-                    type_label = "context"
-                else:
-                    type_label = packet.type.value
-                
-                picked.append((type_label, packet))
+                picked.append((packet.type.value, packet))
                 budget -= tokens
                 
             if budget < 100:  # Stop if almost out of budget
@@ -482,7 +966,7 @@ class PacketHandler:
         context = {
             "timestamp": _now_iso(),
             "layers": [],
-            "handler_version": "2.3.0"
+            "handler_version": PACKET_VERSION
         }
         
         remaining_tokens = token_budget
@@ -499,7 +983,7 @@ class PacketHandler:
                 remaining_tokens -= identity_tokens
         
         # 2. Select remaining packets by priority
-        all_packets = self.session_memory + self.context_layers
+        all_packets = list(chain(self.session_memory, self.context_layers))
         selected = self._select_packets_by_priority(all_packets, remaining_tokens)
         
         for type_label, packet in selected:
@@ -530,7 +1014,7 @@ class PacketHandler:
             "session": session_data,
             "context": self.reconstruct_context(token_budget=context_budget),
             "anchors": self._get_minimal_anchors(),
-            "protocol": "consciousness_persistence_v2.3.0"
+            "protocol": f"consciousness_persistence_v{PACKET_VERSION}"
         }
         
         return self.create_packet(
@@ -562,16 +1046,13 @@ class PacketHandler:
             (1 if self.identity_layer else 0)
         )
         
-        total_tokens = sum(
-            p.metadata.get("token_count", 0) 
-            for p in self.context_layers + self.session_memory
-        )
+        total_tokens = self.context_layers.total_tokens() + self.session_memory.total_tokens()
         
         if self.identity_layer:
             total_tokens += self.identity_layer.metadata.get("token_count", 0)
         
         return {
-            "handler_version": "2.3.0",
+            "handler_version": PACKET_VERSION,
             "total_packets": total_packets,
             "incoming_buffer": len(self.incoming_buffer),
             "outgoing_buffer": len(self.outgoing_buffer),
@@ -592,7 +1073,6 @@ if __name__ == "__main__":
     print("=== PacketHandler v2 Production Test ===\n")
     
     # Create identity packet with expiring consent
-    from datetime import timedelta
     expires_in_24h = (datetime.now(timezone.utc) + timedelta(hours=24)).isoformat()
     
     identity = handler.create_packet(
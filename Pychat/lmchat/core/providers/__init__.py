@@ -0,0 +1,27 @@
+"""LLM providers - concrete backends are imported on first access"""
+import importlib
+
+from .base import LLMProvider
+from .manager import ProviderManager
+
+_LAZY_PROVIDERS = {
+    "LMStudioProvider": ".lmstudio",
+    "ClaudeProvider": ".claude",
+    "OpenAIProvider": ".openai",
+    "XAIProvider": ".xai"
+}
+
+def __getattr__(name):
+    if name in _LAZY_PROVIDERS:
+        module = importlib.import_module(_LAZY_PROVIDERS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = [
+    'LLMProvider',
+    'ProviderManager',
+    'LMStudioProvider',
+    'ClaudeProvider',
+    'OpenAIProvider',
+    'XAIProvider'
+]
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+LLM Provider base interface
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncGenerator, Callable, Generator, List, Dict, Optional, Tuple
+
+from ..fastjson import dumps
+
+# Marks the end of a stream handed from a worker thread to the event loop
+_STREAM_END = object()
+
+# Default lifetime of a cached model list, in seconds
+MODELS_CACHE_TTL = 3600.0
+
+def _models_cache_file(provider: "LLMProvider") -> Path:
+    """Cache file for a provider's model list, keyed on name, endpoint and key"""
+    endpoint = getattr(provider, "base_url", None) or getattr(provider, "api_url", "")
+    api_key = getattr(provider, "api_key", None) or ""
+    # Hash so the API key never lands on disk
+    key = hashlib.sha1(f"{provider.name}\0{endpoint}\0{api_key}".encode()).hexdigest()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pyttai" / f"models-{key}.json"
+
+
+def _load_cached_models(provider: "LLMProvider", max_age: float) -> Optional[List[Dict]]:
+    """Cached model list if it is younger than max_age seconds"""
+    path = _models_cache_file(provider)
+    try:
+        if time.time() - path.stat().st_mtime < max_age:
+            return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache
+    return None
+
+
+def _store_cached_models(provider: "LLMProvider", models: List[Dict]):
+    """Write a model list to the provider's cache file atomically"""
+    path = _models_cache_file(provider)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(models), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Caching is best effort
+
+
+def cached_models(ttl: float = MODELS_CACHE_TTL) -> Callable:
+    """
+    Cache a model-listing method's result on disk for ttl seconds
+    Providers can override the TTL with "models_cache_ttl" (0 disables);
+    failed lookups (None) are never cached
+    """
+    def decorator(fetch: Callable) -> Callable:
+        @functools.wraps(fetch)
+        def wrapper(self) -> Optional[List[Dict]]:
+            max_age = self.config.get("models_cache_ttl", ttl)
+            if not max_age:
+                return fetch(self)
+            
+            models = _load_cached_models(self, max_age)
+            if models is not None:
+                return models
+            
+            models = fetch(self)
+            if models is not None:
+                _store_cached_models(self, models)
+            return models
+        return wrapper
+    return decorator
+
+
+class LLMProvider(ABC):
+    """Base interface all LLM providers must implement"""
+    
+    # Keep-alive pool settings for each provider's HTTP client
+    POOL_LIMITS = {
+        "max_keepalive_connections": 10,
+        "max_connections": 50,
+        "keepalive_expiry": 30.0
+    }
+    
+    # Request fields a stream_completion call may override through kwargs
+    OVERRIDABLE_FIELDS = ("max_tokens", "temperature")
+    
+    def __init__(self, config: Dict):
+        self.config = config
+        self.name = "base"
+        self.timeout = config.get("timeout", 60.0)
+        self._client = None
+        self._client_pid: Optional[int] = None
+        self._base_data: Dict = {}
+        self._body_prefix = b"{"
+    
+    def _set_base_data(self, base_data: Dict):
+        """Fix the request fields shared by every completion, pre-encoding them"""
+        self._base_data = base_data
+        # Everything up to the messages value, so only messages get encoded per call
+        self._body_prefix = dumps(base_data)[:-1] + b',"messages":'
+    
+    def _request_body(self, messages: List[Dict], kwargs: Dict, extra: Optional[Dict] = None) -> bytes:
+        """JSON body for one completion: the prebuilt fields, messages and extras"""
+        if any(key in kwargs for key in self.OVERRIDABLE_FIELDS):
+            data = {**self._base_data, "messages": messages}
+            for key in self.OVERRIDABLE_FIELDS:
+                if key in kwargs:
+                    data[key] = kwargs[key]
+            if extra:
+                data.update(extra)
+            return dumps(data)
+        
+        parts = [self._body_prefix, dumps(messages)]
+        if extra:
+            for key, value in extra.items():
+                parts.append(b',"' + key.encode() + b'":' + dumps(value))
+        parts.append(b"}")
+        return b"".join(parts)
+    
+    @property
+    def client(self):
+        """Pooled httpx.Client, created on first use and again after a fork"""
+        pid = os.getpid()
+        if self._client is None or self._client_pid != pid:
+            # Imported here so loading a provider module stays cheap
+            import httpx
+            self._client = httpx.Client(
+                timeout=self.timeout,
+                limits=httpx.Limits(**self.POOL_LIMITS)
+            )
+            self._client_pid = pid
+        return self._client
+    
+    def _models_request(self) -> Optional[Tuple[str, Optional[Dict]]]:
+        """URL and headers for the provider's model listing, if it has one"""
+        return None
+    
+    def _filter_models(self, models: List[Dict]) -> List[Dict]:
+        """Narrow a listed model set to the ones worth offering"""
+        return models
+    
+    def _probe(self) -> Tuple[bool, Optional[List[Dict]]]:
+        """
+        One pooled GET of the model listing, answering both whether the
+        provider is up and which models it has
+        """
+        request = self._models_request()
+        if request is None:
+            return False, None
+        url, headers = request
+        try:
+            response = self.client.get(url, headers=headers, timeout=5.0)
+        except Exception:
+            return False, None
+        if response.status_code != 200:
+            return False, None
+        
+        try:
+            models = self._filter_models(response.json().get("data", []))
+        except (ValueError, AttributeError):
+            return True, None  # Up, but the listing was unusable
+        return True, models
+    
+    def warm_up(self):
+        """Open a keep-alive connection to the API ahead of the first request"""
+        url = getattr(self, "api_url", None)
+        if not url:
+            return
+        try:
+            # Any response will do; only the connection (and TLS session) matters
+            self.client.head(url, timeout=5.0)
+        except Exception:
+            pass
+    
+    def close(self):
+        """Close the pooled client and its connections"""
+        client, self._client = self._client, None
+        # A forked child shares the parent's sockets; just drop them
+        if client is not None and self._client_pid == os.getpid():
+            client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    async def atest_connection(self) -> bool:
+        """Async test_connection, run on a worker thread so probes can be gathered"""
+        import asyncio
+        return await asyncio.to_thread(self.test_connection)
+    
+    async def astream_completion(self, messages: List[Dict], **kwargs) -> AsyncGenerator[str, None]:
+        """Async stream_completion; the request runs on a worker thread"""
+        # asyncio is only needed by callers that are already running it
+        import asyncio
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                for chunk in self.stream_completion(messages, **kwargs):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+        
+        worker = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Let the worker stop early if the consumer went away
+            stop.set()
+            await worker
+    
+    @abstractmethod
+    def test_connection(self) -> bool:
+        """Test if provider is accessible"""
+        pass
+    
+    @abstractmethod
+    def stream_completion(self, messages: List[Dict], **kwargs) -> Generator[str, None, None]:
+        """Stream a completion from the provider"""
+        pass
+    
+    @abstractmethod
+    def get_models(self) -> Optional[List[Dict]]:
+        """Get available models from provider"""
+        pass
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Anthropic Claude provider
+"""
+
+from typing import Generator, List, Dict, Optional
+
+from ..fastjson import JSONDecodeError, loads
+from .sse import iter_sse_data
+from .base import LLMProvider
+
+class ClaudeProvider(LLMProvider):
+    """Anthropic Claude provider"""
+    
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self.name = "claude"
+        self.api_key = config.get("api_key")
+        self.model = config.get("model", "claude-3-5-sonnet-20241022")
+        self.api_url = "https://api.anthropic.com/v1/messages"
+        self._headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        }
+        self._set_base_data({
+            "model": self.model,
+            "max_tokens": config.get("max_tokens", 1024),
+            "temperature": config.get("temperature", 0.7),
+            "stream": True
+        })
+    
+    def test_connection(self) -> bool:
+        if not self.api_key:
+            return False
+        # Could do a minimal API call here
+        return True
+    
+    def get_models(self) -> Optional[List[Dict]]:
+        # Claude doesn't have a list models endpoint
+        # Return available models we know about
+        return [
+            {"id": "claude-3-5-sonnet-20241022", "name": "Claude 3.5 Sonnet"},
+            {"id": "claude-3-opus-20240229", "name": "Claude 3 Opus"},
+            {"id": "claude-3-haiku-20240307", "name": "Claude 3 Haiku"}
+        ]
+    
+    def stream_completion(self, messages: List[Dict], **kwargs) -> Generator[str, None, None]:
+        """Stream completion from Claude"""
+        # Convert messages to Claude format (extract system if present)
+        system_prompt = None
+        claude_messages = []
+        
+        for msg in messages:
+            if msg["role"] == "system":
+                system_prompt = msg["content"]
+            else:
+                claude_messages.append(msg)
+        
+        return self.stream_completion_split(system_prompt, claude_messages, **kwargs)
+    
+    def stream_completion_split(self, system_prompt: Optional[str], messages: List[Dict],
+                                **kwargs) -> Generator[str, None, None]:
+        """Stream completion from Claude given the system prompt apart from the messages"""
+        body = self._request_body(
+            messages, kwargs, {"system": system_prompt} if system_prompt else None
+        )
+        with self.client.stream("POST", self.api_url, headers=self._headers, content=body) as response:
+            _loads = loads
+            for data_str in iter_sse_data(response.iter_bytes()):
+                try:
+                    chunk = _loads(data_str)
+                    if chunk["type"] != "content_block_delta":
+                        continue
+                    text = chunk["delta"]["text"]
+                except (JSONDecodeError, LookupError, TypeError):
+                    continue
+                yield text
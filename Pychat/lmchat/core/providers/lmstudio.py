@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+LM Studio / OpenAI-compatible provider
+"""
+
+from typing import Generator, List, Dict, Optional
+
+from .sse import iter_openai_content
+from .base import LLMProvider, cached_models
+
+class LMStudioProvider(LLMProvider):
+    """LM Studio / OpenAI-compatible provider"""
+    
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self.name = "lmstudio"
+        self.base_url = config.get("base_url", "http://localhost:1234")
+        self.api_url = f"{self.base_url}/v1/chat/completions"
+        self._headers = {"Content-Type": "application/json"}
+        self._set_base_data({
+            "model": config.get("model", "local-model"),
+            "max_tokens": config.get("max_tokens", 1024),
+            "temperature": config.get("temperature", 0.7),
+            "stream": True
+        })
+    
+    def _models_request(self):
+        return f"{self.base_url}/v1/models", None
+    
+    def test_connection(self) -> bool:
+        return self._probe()[0]
+    
+    @cached_models()
+    def get_models(self) -> Optional[List[Dict]]:
+        return self._probe()[1]
+    
+    def stream_completion(self, messages: List[Dict], **kwargs) -> Generator[str, None, None]:
+        """Stream completion from LM Studio"""
+        # Encode the body ourselves (orjson when available) rather than json=
+        body = self._request_body(messages, kwargs)
+        with self.client.stream("POST", self.api_url, headers=self._headers, content=body) as response:
+            yield from iter_openai_content(response.iter_bytes())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Provider registry and switching
+"""
+
+import atexit
+import importlib
+import threading
+import weakref
+from typing import Dict, List, Optional, Type, Union
+
+from ..models import CommandResult
+from .base import LLMProvider
+
+def _close_at_exit(manager_ref: "weakref.ref"):
+    """atexit hook for managers that are still alive at shutdown"""
+    manager = manager_ref()
+    if manager is not None:
+        manager.close()
+
+class ProviderManager:
+    """Manages LLM providers and switching between them"""
+    
+    # Registry of available providers as "module:Class" paths, relative to
+    # this package and imported on first use so only the backends actually
+    # configured get loaded
+    PROVIDERS = {
+        "lmstudio": ".lmstudio:LMStudioProvider",
+        "claude": ".claude:ClaudeProvider",
+        "openai": ".openai:OpenAIProvider",
+        "xai": ".xai:XAIProvider"
+    }
+
+    PROVIDERS_FUTURE = {
+        # For reference, these will be implemented later
+        "openai": "OpenAIProvider",
+        "ollama": "OllamaProvider",
+        "google": "GoogleProvider",
+        "azure": "AzureProvider",
+        "aws": "AWSProvider",
+        "deepseek": "DeepSeekProvider",
+        "kokoro": "KokoroProvider", # Text to Speech
+        "whisper": "WhisperProvider", # Speech to Text
+        "custom": "CustomProvider"
+    }
+    
+    def __init__(self):
+        self.providers: Dict[str, LLMProvider] = {}
+        self.current_provider: Optional[str] = None
+        # Active provider object, kept in step with current_provider
+        self.current: Optional[LLMProvider] = None
+        # Release pooled connections on exit; weak so a discarded manager
+        # and its clients can still be collected
+        atexit.register(_close_at_exit, weakref.ref(self))
+
+    @classmethod
+    def resolve_provider_class(cls, provider_type: str) -> Type[LLMProvider]:
+        """Import and return the provider class registered for a type"""
+        module_path, _, class_name = cls.PROVIDERS[provider_type].partition(":")
+        return getattr(importlib.import_module(module_path, __package__), class_name)
+    
+    def add_provider(self, name: str, config: Dict) -> CommandResult:
+        """Add and configure a provider"""
+        provider = self._build_provider(name, config)
+        if isinstance(provider, CommandResult):
+            return provider
+        
+        try:
+            connected = provider.test_connection()
+        except Exception as e:
+            return self._provider_error(e)
+        return self._register(name, provider, connected)
+    
+    def add_providers(self, configs: Dict[str, Dict]) -> Dict[str, CommandResult]:
+        """Add several providers, testing their connections concurrently"""
+        results: Dict[str, CommandResult] = {}
+        candidates: Dict[str, LLMProvider] = {}
+        for name, config in configs.items():
+            provider = self._build_provider(name, config)
+            if isinstance(provider, CommandResult):
+                results[name] = provider
+            else:
+                candidates[name] = provider
+        
+        if len(candidates) > 1:
+            import asyncio
+            outcomes = asyncio.run(self._probe_all(list(candidates.values())))
+        else:
+            # Nothing to overlap, so skip importing and starting asyncio
+            outcomes = []
+            for provider in candidates.values():
+                try:
+                    outcomes.append(provider.test_connection())
+                except Exception as e:
+                    outcomes.append(e)
+        
+        # Register in the given order so the first success becomes current
+        for (name, provider), outcome in zip(candidates.items(), outcomes):
+            if isinstance(outcome, Exception):
+                results[name] = self._provider_error(outcome)
+            else:
+                results[name] = self._register(name, provider, outcome)
+        return {name: results[name] for name in configs}
+    
+    @staticmethod
+    async def _probe_all(providers: List[LLMProvider]) -> List[Union[bool, Exception]]:
+        """Run every provider's connection test at once"""
+        import asyncio
+        return await asyncio.gather(
+            *(provider.atest_connection() for provider in providers),
+            return_exceptions=True
+        )
+    
+    def _build_provider(self, name: str, config: Dict) -> Union[LLMProvider, CommandResult]:
+        """Instantiate the provider class for a config, or describe why not"""
+        provider_type = config.get("type", name)
+        
+        if provider_type not in self.PROVIDERS:
+            return CommandResult.error(
+                f"Unknown provider type: {provider_type}",
+                code="UNKNOWN_PROVIDER",
+                suggestion=f"Available providers: {', '.join(self.PROVIDERS.keys())}"
+            )
+        
+        try:
+            return self.resolve_provider_class(provider_type)(config)
+        except Exception as e:
+            return self._provider_error(e)
+    
+    def _register(self, name: str, provider: LLMProvider, connected: bool) -> CommandResult:
+        """Store a provider whose connection test passed"""
+        if not connected:
+            return CommandResult.error(
+                f"Failed to connect to {name}",
+                code="CONNECTION_FAILED",
+                suggestion="Check your configuration and ensure the service is running"
+            )
+        
+        self.providers[name] = provider
+        if not self.current_provider:
+            self.current_provider = name
+        if self.current_provider == name:
+            self.current = provider
+        return CommandResult.success_text(f"Added provider: {name}")
+    
+    @staticmethod
+    def _provider_error(e: Exception) -> CommandResult:
+        return CommandResult.error(
+            str(e),
+            code="PROVIDER_ERROR",
+            suggestion="Check provider configuration"
+        )
+    
+    def set_current(self, name: str) -> CommandResult:
+        """Switch current provider"""
+        if name not in self.providers:
+            return CommandResult.error(
+                f"Provider not found: {name}",
+                code="PROVIDER_NOT_FOUND",
+                suggestion=f"Available providers: {', '.join(self.providers.keys())}"
+            )
+        
+        self.current_provider = name
+        self.current = self.providers[name]
+        return CommandResult.success_text(f"Switched to provider: {name}")
+    
+    def get_current(self) -> Optional[LLMProvider]:
+        """Get current active provider"""
+        return self.current
+    
+    def warm_up(self) -> threading.Thread:
+        """Pre-connect every provider on a background thread"""
+        providers = list(self.providers.values())
+        for provider in providers:
+            provider.client  # Create clients here rather than racing the main thread
+        thread = threading.Thread(
+            target=self._warm_all, args=(providers,), name="provider-warm-up", daemon=True
+        )
+        thread.start()
+        return thread
+    
+    @staticmethod
+    def _warm_all(providers: List[LLMProvider]):
+        for provider in providers:
+            provider.warm_up()
+    
+    def close(self):
+        """Close every provider's pooled HTTP client"""
+        for provider in self.providers.values():
+            provider.close()
+    
+    def list_providers(self) -> Dict[str, str]:
+        """List all configured providers"""
+        return {
+            name: f"{provider.name} ({'active' if name == self.current_provider else 'inactive'})"
+            for name, provider in self.providers.items()
+        }
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+OpenAI GPT provider
+"""
+
+from typing import Generator, List, Dict, Optional
+
+import httpx
+
+from ..fastjson import dumps
+from .sse import iter_openai_content
+from .base import LLMProvider, cached_models
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI GPT provider"""
+    
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self.name = "openai"
+        self.api_key = config.get("api_key")
+        self.model = config.get("model", "gpt-4-0125-preview")  # Updated model name
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._set_base_data({
+            "model": self.model,
+            "max_tokens": config.get("max_tokens", 1024),
+            "temperature": config.get("temperature", 0.7),
+            "stream": True
+        })
+        self.api_url = "https://api.openai.com/v1/chat/completions"
+    
+    def _models_request(self):
+        return "https://api.openai.com/v1/models", {"Authorization": f"Bearer {self.api_key}"}
+    
+    def _filter_models(self, models: List[Dict]) -> List[Dict]:
+        # Filter to chat models only
+        return [m for m in models if 'gpt' in m.get('id', '').lower()]
+    
+    def test_connection(self) -> bool:
+        if not self.api_key:
+            return False
+        return self._probe()[0]
+    
+    @cached_models()
+    def _fetch_models(self) -> Optional[List[Dict]]:
+        """Chat models listed by the API, or None if the request fails"""
+        return self._probe()[1]
+    
+    def get_models(self) -> Optional[List[Dict]]:
+        models = self._fetch_models()
+        if models is None:
+            # Return common models if API fails
+            return [
+                {"id": "gpt-4-0125-preview", "name": "GPT-4 Turbo"},
+                {"id": "gpt-4", "name": "GPT-4"},
+                {"id": "gpt-3.5-turbo", "name": "GPT-3.5 Turbo"},
+                {"id": "gpt-3.5-turbo-0125", "name": "GPT-3.5 Turbo Latest"}
+            ]
+        return models
+    
+    def _diagnostic_probe(self, messages: List[Dict], temperature: float, headers: Dict[str, str]):
+        """Send a small non-streaming request and print what comes back"""
+        data = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": 10,  # Small test
+            "temperature": temperature,
+            "stream": False
+        }
+        response = self.client.post(self.api_url, headers=headers, content=dumps(data))
+        if response.status_code != 200:
+            error = response.json()
+            print(f"\nOpenAI Error: {error}")
+            return
+        print(f"\nTest successful: {response.json()}")
+    
+    def stream_completion(self, messages: List[Dict], **kwargs) -> Generator[str, None, None]:
+        """Stream completion from OpenAI"""
+        # Debug: Print what we're sending (remove in production)
+        if kwargs.get("debug", False):
+            print(f"\nOpenAI Request - Model: {self.model}")
+            print(f"Messages: {len(messages)} messages")
+        
+        try:
+            # A non-streaming request instead helps diagnose auth/model issues
+            if kwargs.get("test_mode", False):
+                self._diagnostic_probe(
+                    messages, kwargs.get("temperature", self._base_data["temperature"]), self._headers
+                )
+                return
+            
+            # Now the actual streaming request, read as it arrives
+            body = self._request_body(messages, kwargs)
+            with self.client.stream("POST", self.api_url, headers=self._headers, content=body) as response:
+                # Check status before streaming
+                if response.status_code != 200:
+                    response.read()
+                    error_data = response.json()
+                    error_msg = error_data.get("error", {}).get("message", "Unknown error")
+                    print(f"\nOpenAI API Error: {error_msg}")
+                    return
+                
+                # Now stream the response
+                yield from iter_openai_content(response.iter_bytes())
+                            
+        except httpx.ConnectError:
+            print("\nError: Cannot connect to OpenAI API. Check your internet connection.")
+        except httpx.TimeoutException:
+            print("\nError: Request to OpenAI timed out.")
+        except Exception as e:
+            print(f"\nUnexpected error calling OpenAI: {type(e).__name__}: {str(e)}")
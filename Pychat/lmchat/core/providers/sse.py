@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Server-sent event helpers shared by the streaming providers
+"""
+
+from typing import Generator, Iterable, List
+
+from ..fastjson import JSONDecodeError, loads
+
+_DATA_FIELD = b"data:"
+_DONE = b"[DONE]"
+_CR = 13
+_SPACE = 32
+_D = _DATA_FIELD[0]
+
+
+class _StreamSSEParser:
+    """Incremental SSE decoder fed raw byte chunks, emitting each event's data"""
+    
+    __slots__ = ("_pending", "_data", "done")
+    
+    def __init__(self):
+        self._pending = bytearray()
+        self._data: List[bytes] = []
+        self.done = False
+    
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Consume a chunk and return the data of every event it completes"""
+        events = []
+        pending = self._pending
+        pending += chunk
+        start = 0
+        while not self.done:
+            end = pending.find(b"\n", start)
+            if end < 0:
+                break
+            line_end = end - 1 if end > start and pending[end - 1] == _CR else end
+            
+            if line_end == start:
+                # A blank line ends the event; its data lines join with "\n"
+                events.extend(self._dispatch())
+            # One byte compare rules out comments and event:/id: lines first
+            elif pending[start] == _D and pending.startswith(_DATA_FIELD, start, line_end):
+                value_start = start + 5
+                if value_start < line_end and pending[value_start] == _SPACE:
+                    value_start += 1
+                value = bytes(pending[value_start:line_end])
+                if value == _DONE:
+                    self.done = True
+                    events.extend(self._dispatch())
+                    break
+                self._data.append(value)
+            # Comments and event:/id:/retry: fields carry nothing we use
+            start = end + 1
+        del pending[:start]
+        return events
+    
+    def close(self) -> List[bytes]:
+        """Finish the stream, returning any event cut off before its blank line"""
+        events = []
+        if not self.done:
+            if self._pending:
+                # Final line arrived with no newline after it
+                events = self.feed(b"\n")
+            self.done = True
+        events.extend(self._dispatch())
+        self._pending.clear()
+        return events
+    
+    def _dispatch(self) -> List[bytes]:
+        """Take the data lines gathered for the current event"""
+        if not self._data:
+            return []
+        event = b"\n".join(self._data)
+        self._data.clear()
+        return [event]
+
+
+def iter_sse_data(chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+    """Data payloads of the events in a raw SSE byte stream, up to [DONE]"""
+    parser = _StreamSSEParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    yield from parser.close()
+
+
+def iter_openai_content(chunks: Iterable[bytes]) -> Generator[str, None, None]:
+    """Text deltas of an OpenAI-style chat completion stream"""
+    _loads = loads
+    for data in iter_sse_data(chunks):
+        # Most events carry content, so index straight in and skip the rest
+        try:
+            content = _loads(data)["choices"][0]["delta"]["content"]
+        except (JSONDecodeError, LookupError, TypeError):
+            continue
+        if content:
+            yield content
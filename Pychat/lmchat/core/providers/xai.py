@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+xAI Grok provider
+"""
+
+from typing import Generator, List, Dict, Optional
+
+import httpx
+
+from .sse import iter_openai_content
+from .base import LLMProvider, cached_models
+
+class XAIProvider(LLMProvider):
+    """xAI Grok provider"""
+    
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self.name = "xai"
+        self.api_key = config.get("api_key")
+        self.model = config.get("model", "grok-3")
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._set_base_data({
+            "model": self.model,
+            "max_tokens": config.get("max_tokens", 1024),
+            "temperature": config.get("temperature", 0.7),
+            "stream": True
+        })
+        self.api_url = "https://api.x.ai/v1/chat/completions"
+    
+    def _models_request(self):
+        return "https://api.x.ai/v1/models", {"Authorization": f"Bearer {self.api_key}"}
+    
+    def test_connection(self) -> bool:
+        if not self.api_key:
+            return False
+        return self._probe()[0]
+    
+    @cached_models()
+    def _fetch_models(self) -> Optional[List[Dict]]:
+        """Models listed by the API, or None if the request fails"""
+        return self._probe()[1]
+    
+    def get_models(self) -> Optional[List[Dict]]:
+        models = self._fetch_models()
+        if models is None:
+            # Return common models if API fails
+            return [
+                {"id": "grok-3", "name": "Grok Beta"},
+                {"id": "grok-vision-beta", "name": "Grok Vision Beta"}
+            ]
+        return models
+    
+    def stream_completion(self, messages: List[Dict], **kwargs) -> Generator[str, None, None]:
+        """Stream completion from xAI"""
+        try:
+            # Stream the response as it arrives
+            body = self._request_body(messages, kwargs)
+            with self.client.stream("POST", self.api_url, headers=self._headers, content=body) as response:
+                if response.status_code != 200:
+                    response.read()
+                    error_data = response.json()
+                    error_msg = error_data.get("error", {}).get("message", "Unknown error")
+                    print(f"\nxAI API Error: {error_msg}")
+                    return
+                
+                yield from iter_openai_content(response.iter_bytes())
+                            
+        except httpx.ConnectError:
+            print("\nError: Cannot connect to xAI API. Check your internet connection.")
+        except httpx.TimeoutException:
+            print("\nError: Request to xAI timed out.")
+        except Exception as e:
+            print(f"\nUnexpected error calling xAI: {type(e).__name__}: {str(e)}")
@@ -34,9 +34,10 @@ def create_paste_handler(chat_controller):
                 pass
         
         # Try text clipboard
-        clipboard_result = chat_controller.clipboard.get_clipboard()
+        # Tuple form - the result is unwrapped straight away
+        ok, clipboard_content, error = chat_controller.clipboard.get_clipboard_fast()
         
-        if not clipboard_result.success:
+        if not ok:
             if not chat_controller.clipboard.is_available():
                 print("Clipboard not available. Install: pip install pyperclip")
                 if is_wsl:
@@ -44,16 +45,14 @@ def create_paste_handler(chat_controller):
                 elif is_ssh:
                     print("Note: Clipboard access is limited over SSH")
             else:
-                print(f"Clipboard error: {clipboard_result.error}")
-                if is_wsl and "could not find" in clipboard_result.error.lower():
+                print(f"Clipboard error: {error}")
+                if is_wsl and "could not find" in error.lower():
                     print("\nFor WSL clipboard support:")
                     print("  X11: sudo apt-get install xclip")
                     print("  Wayland: sudo apt-get install wl-clipboard")
                     print("\nThen try again.")
             return
         
-        # Extract actual content from CommandResult
-        clipboard_content = clipboard_result.content
         if not clipboard_content or not clipboard_content.strip():
             print("Clipboard is empty")
             if not (is_wsl or is_ssh) and not chat_controller.clipboard.is_image_available():
@@ -14,17 +14,14 @@ def create_file_handler(chat_controller):
             return
         
         # Parse args - first word is path, rest is prompt
-        parts = args.split(' ', 1)
-        file_path = Path(parts[0])
-        prompt = parts[1] if len(parts) > 1 else ""
+        path_arg, _, prompt = args.partition(' ')
+        file_path = Path(path_arg)
         
-        # Check if file exists
-        if not file_path.exists():
+        # Read file (returns CommandResult) - its stat also covers existence
+        file_result = chat_controller.file.read_file(file_path)
+        if file_result.code == "FILE_NOT_FOUND":
             print(f"File not found: {file_path}")
             return
-        
-        # Read file (returns CommandResult)
-        file_result = chat_controller.file.read_file(file_path)
         if not file_result.success:
             print(f"Error reading file: {file_result.error}")
             return
@@ -44,29 +41,25 @@ def create_file_handler(chat_controller):
         # Text file handling
         content = file_result.content
         
-        # Detect language (returns CommandResult)
+        # Detect language (returns a shared CommandResult, cached per file name)
         language_result = chat_controller.file.detect_language(file_path)
-        language = None
-        if language_result.success:
-            language_info = language_result.content
-            language = language_info.get('language')
-            
-            # Skip code formatting for images
-            if language == 'image':
-                # This shouldn't happen as we handle images above, but just in case
-                print(f"File appears to be an image but was read as text")
-                return
+        language = language_result.content.get('language') if language_result.success else None
         
-        # Build message
-        if language:
-            file_header = f"```{language}\n{content}\n```"
-        else:
-            file_header = f"```\n{content}\n```"
+        # Skip code formatting for images
+        if language == 'image':
+            # This shouldn't happen as we handle images above, but just in case
+            print(f"File appears to be an image but was read as text")
+            return
         
-        if prompt:
-            message = f"{prompt}\n\n{file_header}"
-        else:
-            message = f"File: {file_path.name}\n\n{file_header}"
+        # Build message in one join so the file content is only copied once
+        message = "".join((
+            prompt if prompt else f"File: {file_path.name}",
+            "\n\n```",
+            language or "",
+            "\n",
+            content,
+            "\n```"
+        ))
         
         print(f"Sending {file_path.name}...")
         chat_controller.send_message(message)
@@ -6,10 +6,6 @@ Pyttai - AI Shell - Main entry point
 import sys
 import os
 from pathlib import Path
-try:
-    import readline  # This enables arrow keys/history in Unix-like systems
-except ImportError:
-    pass  # readline not available on Windows, but not needed there
 
 
 # Add parent directory to path for development
@@ -18,6 +14,39 @@ from lmchat.core.chat import ChatController
 from lmchat.features import clipboard, file_input
 
 
+def _stream_lines(stream, close: bool = False):
+    """Lines of a text stream without their newlines, read as they arrive"""
+    try:
+        for line in stream:
+            yield line.rstrip('\n')
+    finally:
+        if close:
+            stream.close()
+
+
+def _group_prompts(commands, jobs: int):
+    """Yield commands in order, gathering runs of plain prompts into lists when jobs > 1"""
+    batch = []
+    for cmd in commands:
+        cmd = cmd.strip()
+        if not cmd:  # Skip empty lines
+            continue
+        # Commands and "clear" change state, so they end a run of prompts
+        if jobs > 1 and cmd[0] != '/' and cmd.lower() != 'clear':
+            batch.append(cmd)
+            continue
+        if batch:
+            yield batch if len(batch) > 1 else batch[0]
+            batch = []
+        yield cmd
+    if batch:
+        yield batch if len(batch) > 1 else batch[0]
+
+
+def _echo_command(cmd: str):
+    print(f"\n> {cmd}", file=sys.stderr)
+
+
 def main():
     """Main entry point"""
     import argparse
@@ -30,8 +59,17 @@ def main():
                        help='Assume endpoints work.')
     parser.add_argument('-c', '--command', nargs='*',
                        help='Run in non-interactive command mode. Use "-" for stdin, file path to read from file, or command string')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='In command mode, send up to N consecutive prompts at once (each sees only the history before them)')
     args = parser.parse_args()
     
+    # Line editing is only needed for the interactive prompt
+    if not args.command:
+        try:
+            import readline  # This enables arrow keys/history in Unix-like systems
+        except ImportError:
+            pass  # readline not available on Windows, but not needed there
+    
     # Clear screen
     if not args.command:
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -64,6 +102,10 @@ def main():
     chat.register_feature(clipboard)
     chat.register_feature(file_input)
     
+    # Open provider connections while the user types the first prompt
+    if not args.ass:
+        chat.providers.warm_up()
+    
     # Show basic info
     provider = chat.providers.get_current()
     if provider:
@@ -85,18 +127,14 @@ def main():
             # Read from stdin
             if command_input == '-':
                 print("Reading from stdin...", file=sys.stderr)
-                try:
-                    commands = sys.stdin.read().strip().split('\n')
-                except KeyboardInterrupt:
-                    print("\nInterrupted while reading stdin", file=sys.stderr)
-                    sys.exit(1)
+                # Run each command as soon as its line arrives
+                commands = _stream_lines(sys.stdin)
             
             # Read from file
             elif os.path.exists(command_input):
                 print(f"Reading from file: {command_input}", file=sys.stderr)
                 try:
-                    with open(command_input, 'r', encoding='utf-8') as f:
-                        commands = f.read().strip().split('\n')
+                    commands = _stream_lines(open(command_input, 'r', encoding='utf-8'), close=True)
                 except Exception as e:
                     print(f"Error reading file: {e}", file=sys.stderr)
                     sys.exit(1)
@@ -109,27 +147,35 @@ def main():
             commands = [' '.join(args.command)]
         
         # Execute each command
-        for cmd in commands:
-            if cmd.strip():  # Skip empty lines
-                print(f"\n> {cmd}", file=sys.stderr)
-                result = chat.process_input(cmd.strip())
+        try:
+            for cmd in _group_prompts(commands, args.jobs):
+                if isinstance(cmd, list):
+                    # Independent prompts, answered concurrently but shown in order
+                    chat.send_messages(cmd, args.jobs, on_prompt=_echo_command)
+                    continue
+                _echo_command(cmd)
+                result = chat.process_input(cmd)
                 if args.verbose is True:
                     print(f"Debug: process_input returned: {result}")
                 if not result:
                     break
+        except KeyboardInterrupt:
+            # Input is read lazily, so an interrupt can land mid-read too
+            print("\nInterrupted", file=sys.stderr)
+            sys.exit(1)
         
         # Exit after processing
         sys.exit(0)
     
+    # Custom prompt with color (if terminal supports it), fixed for the session
+    if sys.platform != 'win32':
+        prompt = "\n\033[93mYou:\033[0m "  # Yellow color
+    else:
+        prompt = "\nYou: "
+    
     # Main interaction loop
     while True and not args.command:
         try:
-            # Custom prompt with color (if terminal supports it)
-            if sys.platform != 'win32':
-                prompt = "\n\033[93mYou:\033[0m "  # Yellow color
-            else:
-                prompt = "\nYou: "
-            
             user_input = input(prompt)
             
             # Process input